@@ -680,26 +680,30 @@ class blast(object):
         else:
             return False
 
+        # Group the non-self hits by query header once, so each sequence visits only its own hits
+        hitsByQuery = {}
+        for nextHit in inList2.blastHits:
+            if nextHit.queryHeader != nextHit.subjectHeader:  # exclude hits that are self-self
+                hitsByQuery.setdefault(nextHit.queryHeader,[]).append(nextHit)
+
         # For each sequence, record any qualifying hits to other sequences in the genome 
         for seq in inList1.fastaList:
             qLength = abs(int(seq.start) - int(seq.end))
-            for nextHit in inList2.blastHits:  # check if it's a hit of seq against non-self seq
-                seqContig = seq.contig
+            seqContig = seq.contig
+            for nextHit in hitsByQuery.get(seq.header,[]):  # hits of seq against non-self seq
                 qSpan = abs(int(nextHit.queryStart) - int(nextHit.queryEnd))
                 try:
                     seqCoverage = 100 * (float(qSpan) / float(qLength))
                 except:
                     seqCoverage = 0.0
-                # Identify hit corresponing to current sequence, and exclude hits that are self-self.
-                if seq.header == nextHit.queryHeader and nextHit.queryHeader != nextHit.subjectHeader:
-                    if float(nextHit.identity) >= float(identity) and seqCoverage >= coverage: # check hit quality
-                        newParalog = copy.deepcopy(self.paralogT) # replicate the paralog template
-                        newParalog.header   = nextHit.subjectHeader
-                        newParalog.coverage = seqCoverage
-                        newParalog.contig   = seqContig
-                        newParalog.blastHit = nextHit
-                        seq.paralogList.append(newParalog) # add to list of paralogs for this sequence object
-                        paralogCount += 1 
+                if float(nextHit.identity) >= float(identity) and seqCoverage >= coverage: # check hit quality
+                    newParalog = copy.deepcopy(self.paralogT) # replicate the paralog template
+                    newParalog.header   = nextHit.subjectHeader
+                    newParalog.coverage = seqCoverage
+                    newParalog.contig   = seqContig
+                    newParalog.blastHit = nextHit
+                    seq.paralogList.append(newParalog) # add to list of paralogs for this sequence object
+                    paralogCount += 1 
         return paralogCount 
 
     def compareHits(self,inList1,inList2,kvargs): # Compare hits between 2 gene/protein sets
@@ -1,4 +1,4 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 
 #######################################################
 #
@@ -30,31 +30,22 @@
 #
 # Method:
 #    GetArguments
+#    pp_threaded
+#    main
 #
 #################################################################
 # This code was developed by Carol L. Ecale Zhou at Lawrence Livermore National Laboratory.
 # THIS CODE IS COVERED BY THE GPL3 LICENSE. SEE INCLUDED FILE GPL-3.PDF FOR DETAILS.
 
-import sys, os, re, string, copy
+import sys, os, re
 from subprocess import call
-import subprocess
-
-# Set messaging booleans
-PHATE_PROGRESS = False
-PHATE_MESSAGES = False
-PHATE_WARNINGS = False
-PHATE_PROGRESS_STRING = os.environ["PHATE_PHATE_PROGRESS"]
-PHATE_MESSAGES_STRING = os.environ["PHATE_PHATE_MESSAGES"]
-PHATE_WARNINGS_STRING = os.environ["PHATE_PHATE_WARNINGS"]
-if PHATE_PROGRESS_STRING.lower() == 'true':
-    PHATE_PROGRESS = True
-if PHATE_MESSAGES_STRING.lower() == 'true':
-    PHATE_MESSAGES = True
-if PHATE_WARNINGS_STRING.lower() == 'true':
-    PHATE_WARNINGS = True
-
-if PHATE_PROGRESS:
-    print("cgp_ppCGPMwrapper says, Begin post-process CGPM wrapper code.")
+from multiprocessing import Pool
+
+# Set messaging booleans; an unset variable means False
+def envFlag(name):
+    return os.environ.get(name,'').lower() == 'true'
+
+PHATE_PROGRESS, PHATE_MESSAGES, PHATE_WARNINGS = map(envFlag, ("PHATE_PHATE_PROGRESS","PHATE_PHATE_MESSAGES","PHATE_PHATE_WARNINGS"))
 
 #### CONFIGURABLE
 
@@ -63,20 +54,28 @@ POST_PROCESS_CGPM_CODE = PYTHON_CODE_HOME + "postProcessCGPM.py"  # use current
 CGPM_REPORT = "compareGeneProfiles_main.report"
 CGPM_LOG    = "compareGeneProfiles_main.log"
 
+# Fixed leading and trailing arguments of every postProcessCGPM.py command line
+POST_PROCESS_CGPM_PREFIX = (sys.executable,POST_PROCESS_CGPM_CODE)  # same interpreter as this wrapper
+POST_PROCESS_CGPM_SUFFIX = ("-r",CGPM_REPORT)
+
 # PATTERNS for recognizing genome 1's & 2's genome and annotation files
 
-p_g1 = re.compile('\#1.*\.fasta')
-p_g2 = re.compile('\#2.*\.fasta')
-p_a1 = re.compile('\#1.*\.gff')
-p_a2 = re.compile('\#2.*\.gff')
+# Log lines have the form "genome file #1: <path>" / "annotation file #2: <path>", so the
+# #1/#2 tag is always the 3rd space-separated field. A single alternation, anchored at the
+# start of the line past the first two fields, is matched once per line; the name of the
+# matching group (g1, g2, a1, a2) identifies which file was found. The log is read as bytes,
+# and only the matched filename is decoded.
 
-#### FILES
+p_all = re.compile(rb'\S+ \S+ (?:(?P<g1>#1.*\.fasta)|(?P<g2>#2.*\.fasta)|(?P<a1>#1.*\.gff)|(?P<a2>#2.*\.gff))', re.ASCII)
 
-logFile = "ppCGPMwrapper.log"
-LOGFILE = open(logFile,"w")
-LOGFILE.write("%s\n" % ("Begin log file"))
-LOGFILE.write("%s%s\n" % ("Version of postProcessCGPM.py being used:",POST_PROCESS_CGPM_CODE))
-LOGFILE.write("%s%s\n" % ("PYTHON_CODE_HOME is ",PYTHON_CODE_HOME))
+# For each group name: (index of genome 1 or 2 in genomeFiles, genomeFiles key, bit recorded in 'found')
+FILE_TAG_DISPATCH = {
+    'g1' : (0, "genome",     0b0001),
+    'g2' : (1, "genome",     0b0010),
+    'a1' : (0, "annotation", 0b0100),
+    'a2' : (1, "annotation", 0b1000),
+    }
+ALL_FILES_FOUND = 0b1111
 
 #### CONSTANTS
 
@@ -88,112 +87,127 @@ USAGE_STRING = "Usage:  ppCGPMwrapper.py\nFor more information, type: ppCGPMwrap
 
 INPUT_STRING = "Input:  this program requires no input parameters."
 
-##### Get command-line arguments
-
-argCount = len(sys.argv)
-if argCount in ACCEPTABLE_ARG_COUNT:
-    if argCount == 2:
-        match = re.search("help", sys.argv[1].lower())
-        if match:
-            print (HELP_STRING)
-            exit(0)
-        match = re.search("usage", sys.argv[1].lower())
-        if match:
-            print (USAGE_STRING)
-            exit(0)
-        match = re.search("input", sys.argv[1].lower())
-        if match:
-            print (INPUT_STRING)
-            exit(0)
-else:
-    print ("Invalid input parameters. For help, type: ppCGPMwrapper.py help")
-    exit(0)
-
-#####
-
-genomeFiles1  = {
-    "strain"     : "",  # name of strain (e.g., AmesAncestor)
-    "genome"     : "",  # filename containing genome (multi-)fasta
-    "annotation" : "",  # filename containing genome annotations
-    "genes"      : "",  # filename containing gene sequences 
-    "proteins"   : "",  # filename containing protein translations
-    }
-genomeFiles2  = {
-    "strain"     : "",  # name of strain (e.g., AmesAncestor)
-    "genome"     : "",  # filename containing genome (multi-)fasta
-    "annotation" : "",  # filename containing genome annotations
-    "genes"      : "",  # filename containing gene sequences 
-    "proteins"   : "",  # filename containing protein translations
-    }
-
-# Get list of results directories from previous (compareGeneProfiles_main.py) calculations
-
-command = "ls . | grep \'Results_\'"  # Get list of Results directories in current directory
-proc = subprocess.Popen([command], stdout=subprocess.PIPE, shell=True)
-(out, err) = proc.communicate()
-if err:
-    print "ERROR:", err
-dirsList = []
-dirsList = out.split('\n')
-
-# Walk through each directory name, capture the genome 1 & 2 genome and annotation path/filenames...
-# ...then re-construct the gene and protein filenames, and finally, execute postProcessCGPM.py over
-# the binary-comparison report file.
-
-if PHATE_PROGRESS:
-    print("cgp_ppCGPMwrapper says, Capturing input filenames and computing outfile names.")
-count = 0; fragments = []; lineFragments = []
-for resultDir in dirsList:
-    match = re.search('Results_',resultDir)  # Make sure it's a correct directory name
-    if match:  #***                               # Process .report file in this directory
-        cgpmReport = CGPM_REPORT  # Construct .report and .log path/filenames
-        cgpmLog    = resultDir + '/' + CGPM_LOG 
-
-        ### Get absolute path/filename for genome and annotation files of binary comparison
-        CGPM_LOG_HANDLE = open(cgpmLog,"r")  # Log file contains names of genome fasta and annotation files
-        fLines = CGPM_LOG_HANDLE.read().splitlines()
-        for line in fLines:
-            match = re.findall(p_g1,line)  # Genome 1 fasta path/filename in this line
+# Files for genome 1 and genome 2 of a binary comparison; a fresh dict is made for each directory
+# so that a tag missing from one log cannot carry over a value from the previous directory.
+GENOME_FILES_KEYS = (
+    "strain",      # name of strain (e.g., AmesAncestor)
+    "genome",      # filename containing genome (multi-)fasta
+    "annotation",  # filename containing genome annotations
+    "genes",       # filename containing gene sequences 
+    "proteins",    # filename containing protein translations
+    )
+
+##### Threading method
+# postProcessCGPM.py writes its output to its working directory, so it is run in the Results directory
+def pp_threaded(job):
+    (resultDir,g1genes,g2genes) = job
+    call((*POST_PROCESS_CGPM_PREFIX,"-g1",g1genes,"-g2",g2genes,*POST_PROCESS_CGPM_SUFFIX),cwd=resultDir)
+    return resultDir
+
+##### Main
+# Everything that reads the command line, the log or the Results directories runs from main(), so that
+# worker processes (which re-import this module under the spawn start method) only see the definitions above.
+def main():
+    if PHATE_PROGRESS:
+        print("cgp_ppCGPMwrapper says, Begin post-process CGPM wrapper code.")
+
+    #### FILES
+
+    logFile = "ppCGPMwrapper.log"
+    LOGFILE = open(logFile,"w")
+    LOGFILE.write("Begin log file\n")
+    LOGFILE.write(f"Version of postProcessCGPM.py being used:{POST_PROCESS_CGPM_CODE}\n")
+    LOGFILE.write(f"PYTHON_CODE_HOME is {PYTHON_CODE_HOME}\n")
+
+    ##### Get command-line arguments
+
+    argCount = len(sys.argv)
+    if argCount in ACCEPTABLE_ARG_COUNT:
+        if argCount == 2:
+            match = re.search("help", sys.argv[1].lower())
             if match:
-                lineFragments = line.split(' ')
-                genomeFiles1["genome"] = lineFragments[3] # in 4th position, if you split on space
-                fragments = genomeFiles1["genome"].split('.fasta')
-                genomeFiles1["genes"]    = fragments[0] + '_gene.fasta' # reconstruct genes fasta filename
-                genomeFiles1["proteins"] = fragments[0] + '_prot.fasta'
-                continue 
-            match = re.findall(p_g2,line)  # Genome 2 fasta path/filename in this line
+                print (HELP_STRING)
+                exit(0)
+            match = re.search("usage", sys.argv[1].lower())
             if match:
-                lineFragments = line.split(' ')
-                genomeFiles2["genome"] = lineFragments[3]
-                fragments = genomeFiles2["genome"].split('.fasta')
-                genomeFiles2["genes"]    = fragments[0] + '_gene.fasta'
-                genomeFiles2["proteins"] = fragments[0] + '_prot.fasta'
-                continue 
-            match = re.findall(p_a1,line)  # Genome 1 annotation path/filename in this line
+                print (USAGE_STRING)
+                exit(0)
+            match = re.search("input", sys.argv[1].lower())
             if match:
-                lineFragments = line.split(' ')
-                genomeFiles1["annotation"] = lineFragments[3]
-                continue 
-            match = re.findall(p_a2,line)  # Genome 2 annotation path/filename in this line
-            if match:
-                lineFragments = line.split(' ')
-                genomeFiles2["annotation"] = lineFragments[3]
-                continue 
-        CGPM_LOG_HANDLE.close() 
-        
-        # Run postProcessCGMP.py for the current binary comparison
-        currentDir = os.getcwd()  # where are we now
-        os.chdir(resultDir)       # change to current Results directory
-        call(["python",POST_PROCESS_CGPM_CODE,"-g1",genomeFiles1["genes"],"-g2",genomeFiles2["genes"],"-r",cgpmReport])
-        os.chdir(currentDir)      # return
+                print (INPUT_STRING)
+                exit(0)
+    else:
+        print ("Invalid input parameters. For help, type: ppCGPMwrapper.py help")
+        exit(0)
+
+    #####
+
+    # Get list of results directories from previous (compareGeneProfiles_main.py) calculations
+
+    with os.scandir('.') as entries:  # single pass; the directory handle is closed as soon as the listing is read
+        dirsList = sorted(entry.name for entry in entries
+                          if entry.name.startswith('Results_') and entry.is_dir(follow_symlinks=False))
+
+    # Walk through each directory name, capture the genome 1 & 2 genome and annotation path/filenames,
+    # then re-construct the gene and protein filenames. Each binary comparison is recorded as a job;
+    # postProcessCGPM.py is then executed over each job's report file once all logs have been read.
+
+    if PHATE_PROGRESS:
+        print("cgp_ppCGPMwrapper says, Capturing input filenames and computing outfile names.")
+    count = 0; stem = ""
+    jobs = []  # (resultDir, genome 1 genes file, genome 2 genes file)
+    match_all = p_all.match  # bound once; avoids attribute lookup per log line
+    for resultDir in dirsList:  # Process .report file in each Results_ directory
+        cgpmLog = resultDir + '/' + CGPM_LOG  # Construct .log path/filename; the .report name is fixed
+
+        ### Get absolute path/filename for genome and annotation files of binary comparison
+        # Log file contains names of genome fasta and annotation files; stop reading once all 4 are found
+        genomeFiles1 = dict.fromkeys(GENOME_FILES_KEYS, "")
+        genomeFiles2 = dict.fromkeys(GENOME_FILES_KEYS, "")
+        genomeFiles  = (genomeFiles1,genomeFiles2)
+        found = 0
+        with open(cgpmLog,"rb") as CGPM_LOG_HANDLE:
+            for line in CGPM_LOG_HANDLE:
+                if b'#1' not in line and b'#2' not in line:  # cheap test before running the pattern
+                    continue
+                match = match_all(line)  # anchored: fails fast on lines of another shape
+                if not match:
+                    continue
+                line = line.rstrip(b'\r\n')
+                (genomeIndex,fileKey,foundBit) = FILE_TAG_DISPATCH[match.lastgroup]
+                files = genomeFiles[genomeIndex]
+                files[fileKey] = os.fsdecode(line.split(b' ',4)[3])  # in 4th position, if you split on space
+                if fileKey == "genome":  # reconstruct genes and proteins fasta filenames
+                    stem = files["genome"].rpartition('.fasta')[0]
+                    files["genes"]    = stem + '_gene.fasta'
+                    files["proteins"] = stem + '_prot.fasta'
+                found |= foundBit
+                if found == ALL_FILES_FOUND:
+                    break
+        jobs.append((resultDir,genomeFiles1["genes"],genomeFiles2["genes"]))
+
+    # Run postProcessCGMP.py for each binary comparison
+    # postProcessCGPM.py does its work at module level, so it cannot be imported and called in-process;
+    # each job is run as a separate invocation, and the jobs are independent, so they are run in parallel.
+    if PHATE_PROGRESS:
+        print(f"cgp_ppCGPMwrapper says, Running post-processing over {len(jobs)} comparisons.")
+    logLines = []  # written to LOGFILE in one call once all jobs have returned
+    pp_pool = Pool(os.cpu_count())
+    for resultDir in pp_pool.imap(pp_threaded, jobs):  # results arrive in job order
         count += 1 
-        LOGFILE.write("%s%s\n" % ("Completed post-processing in directory ",resultDir))
+        logLines.append(f"Completed post-processing in directory {resultDir}\n")
         if PHATE_PROGRESS:
-            print("cgp_ppCGPMwrapper says, Completed post-processing in directory ",resultDir)
+            print(f"cgp_ppCGPMwrapper says, Completed post-processing in directory {resultDir}")
+    pp_pool.close()
+    pp_pool.join()
+    LOGFILE.writelines(logLines)
+
+    ##### Clean up
 
-##### Clean up
+    LOGFILE.write(f"Execution complete. {count} jobs completed.\n")
+    if PHATE_PROGRESS:
+        print(f"cgp_ppCGPMwrapper says, Execution complete. {count} jobs completed.")
+    LOGFILE.close()
 
-LOGFILE.write("%s%s%s\n" % ("Execution complete. ",count," jobs completed." ))
-if PHATE_PROGRESS:
-    print ("cgp_ppCGPMwrapper says, Execution complete.", count, "jobs completed.")
-LOGFILE.close()
+if __name__ == '__main__':
+    main()
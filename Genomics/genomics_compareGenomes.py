@@ -7,6 +7,15 @@
 #
 # Module comprising classes and data structures for comparing genomes
 #
+# Functions (report parsing; run in worker processes by comparison.parseReportFiles):
+#    parseGeneCallString
+#    readBestHits
+#    readParalogs
+#    readResultsDirectory
+#
+# Functions (identifiers):
+#    makeIdentifier
+#
 # Classes and Methods:
 #    class comparison
 #       performComparison
@@ -19,14 +28,17 @@
 #       loadBestHits
 #       loadParalogs
 #       addParalog2genome
+#       addParalogs2genomes
 #       addGeneCallString
 #       addHit2genome
+#       updateReferenceGenomeList
 #       findGenomeObject
 #       addMutualBestHit
 #       addSingularBestHit
 #       addLoner
 #     - comparison genomic methods
 #       computeHomologyGroups
+#       computeCoreGenome
 #       findGeneParalog
 #       createGeneHomologyFastaFiles
 #       createProteinHomologyFastaFiles
@@ -61,11 +73,16 @@
 #       printAll2file
 #       printAll
 #    class genome
+#       recordMutualBestHit
+#       addGene
+#       addProtein
 #       addParalog
+#       ingestParalogs
 #     - genome data check methods
 #       checkMutualBestHitList
 #       checkSingularBestHitList
 #       checkUnique
+#       checkUniqueAttribute
 #     - genome print methods
 #       printAll2file
 #       printAll
@@ -97,33 +114,17 @@
 # This code was developed by Carol L. Ecale Zhou at Lawrence Livermore National Laboratory.
 # THIS CODE IS COVERED BY THE GPL3 LICENSE. SEE INCLUDED FILE GPL-3.PDF FOR DETAILS.
 
-import re, os, copy
-import subprocess
-import ast
+import sys, re, os
+import ast, io
+from operator import itemgetter
+from multiprocessing import Pool
 
 CODE_BASE_DIR    = ""
 OUTPUT_DIR       = ""
 
 # Verbosity
+# The PHATE_PHATE_* settings are overridden here: this module always reports progress, warnings and messages
 
-PHATE_WARNINGS = False
-PHATE_MESSAGES = False
-PHATE_PROGRESS = False
-
-PHATE_WARNINGS_STRING = os.environ["PHATE_PHATE_WARNINGS"]
-PHATE_MESSAGES_STRING = os.environ["PHATE_PHATE_MESSAGES"]
-PHATE_PROGRESS_STRING = os.environ["PHATE_PHATE_PROGRESS"]
-
-if PHATE_WARNINGS_STRING.lower() == 'true':
-    PHATE_WARNINGS = True
-
-if PHATE_MESSAGES_STRING.lower() == 'true':
-    PHATE_MESSAGES = True
-
-if PHATE_PROGRESS_STRING.lower() == 'true':
-    PHATE_PROGRESS = True
-
-# Override
 PHATE_PROGRESS = True
 PHATE_WARNINGS = True
 PHATE_MESSAGES = True
@@ -194,6 +195,225 @@ G1_LENGTH            = 27
 G2_SPAN              = 28
 G2_LENGTH            = 29
 
+# Pulls the fields used by readBestHits out of a split report line, in one call
+getReportFields      = itemgetter(GENOME_TYPE,G1_HEADER,G1_CONTIG,G1_ANNOTATIONS,G2_HEADER,G2_CONTIG,G2_ANNOTATIONS)
+
+# Pattern for parsing CGP output files; compiled once, used per line
+p_paralogPath        = re.compile(r'PARALOGS\sfor\sgenome\s(.*)')
+
+# Function parseGeneCallString extracts the genecall name from the annotation string
+def parseGeneCallString(inString):
+    # The annotation string is the repr of a list of lists, e.g. "[['cds5', ...], ...]", so the
+    # genecall string is normally just the first quoted item; slice it out directly
+    if inString.startswith("[['") or inString.startswith('[["'):
+        quote = inString[2]
+        end = inString.find(quote,3)
+        if end != -1 and '\\' not in inString[3:end]:
+            return inString[3:end]
+    inList = ast.literal_eval(inString) # Convert string representation of a list to an actual list
+    geneCallString = inList[0][0]          # First element of the list is the genecall string
+    return geneCallString
+
+# Function readBestHits reads the CGP report file in a single pass, picking up mutual-best and singular-best hits
+# plus loners. Each hit is returned as a dataArgs dict, for method comparison.addHit2genome to record in the
+# genome's gene_protein data structure.
+def readBestHits(genome1,genome2,reportFile):
+    PROTEIN = False; hitCount = 0; hitList = []
+
+    # Select and process mutual-best-hit data lines
+    # Gene hits are loaded first, then protein
+    with open(reportFile,"r") as REPORT_H:
+        for rLine in REPORT_H:
+            rLine = rLine.rstrip('\r\n')
+            genomeNum = ""; hitType = ""
+            # Skip lines not to be processed in this method; dispatch on the first character
+            if not rLine:
+                continue
+            firstChar = rLine[0]
+            if firstChar == '#':
+                if rLine.startswith('#PROTEIN HITS'):
+                    PROTEIN = True  # Prepare for loading protein hits next
+                continue
+            if firstChar.isdigit():
+                fields = rLine.split('\t',G2_ANNOTATIONS+1)   # fields beyond G2_ANNOTATIONS are not used here
+                (genomeType,header1,contig1,annotations1,header2,contig2,annotations2) = getReportFields(fields)
+                (genomeNum,hitType) = genomeType.split('_')
+            else:
+                if PHATE_WARNINGS:
+                    print("genomics_compareGenomes says, WARNING: expected dataLine: ",rLine)
+                continue
+
+            # Prepare arguments for passing to addHit2genome method
+            if genomeNum == "genome1":
+                hitType = hitType + '1'
+            elif genomeNum == "genome2":
+                hitType = hitType + '2'
+            else:
+                hitType = ""
+                if PHATE_WARNINGS:
+                    print("genomics_compareGenomes says, WARNING: Unrecognized GENOME_TYPE")
+
+            # Record data from reportFile dataline
+            # Fields pertaining to gene or protein
+            geneCall1 = ""; geneCall2 = ""
+            if annotations1 != "":
+                geneCall1 = parseGeneCallString(annotations1)
+            if annotations2 != "":
+                geneCall2 = parseGeneCallString(annotations2)
+
+            # Protein- and gene-specific fields
+            if PROTEIN:
+                hitFlavor = "protein"
+                gene1     = "";       gene2    = ""
+                protein1  = header1;  protein2 = header2
+            else: # gene
+                hitFlavor = "gene"
+                gene1     = header1;  gene2    = header2
+                protein1  = "";       protein2 = ""
+
+            # Data structure for passing parameters to comparison.addHit2genome(); built in one go
+            dataArgs = { 
+                "genome1"      : genome1,   # the fasta file name without extension
+                "genome2"      : genome2,   # the fasta file name without extension
+                "contig1"      : contig1,
+                "contig2"      : contig2,
+                "gene1"        : gene1,
+                "gene2"        : gene2,
+                "protein1"     : protein1,
+                "protein2"     : protein2,
+                "geneCall1"    : geneCall1,
+                "geneCall2"    : geneCall2,
+                "annotations1" : annotations1,
+                "annotations2" : annotations2,
+                "hitType"      : hitType,
+                "hitFlavor"    : hitFlavor,
+                }
+            hitList.append(dataArgs)
+
+    return hitList
+
+# Function readParalogs reads the CGP paralogs file; each paralog is returned as a dataArgs dict, for method
+# comparison.addParalogs2genomes to record in the genome's paralog lists.
+def readParalogs(paralogFile):
+    paralogList = []
+    fields = []; genomeNum = ""; paralogType = ""; genomeName = ""
+    GENE = False; PROTEIN = False
+    query = ""; subject = ""
+
+    # First, reset dataArgs data structure, for passing parameters to comparison.addParalog2genome
+    dataArgs = { 
+        "genome1"      : "",   # the fasta file name
+        "genome2"      : "",   
+        "contig1"      : "",   
+        "contig2"      : "",   
+        "gene1"        : "",
+        "gene2"        : "",
+        "protein1"     : "",
+        "protein2"     : "",
+        "geneCall1"    : "",
+        "geneCall2"    : "",
+        "annotations1" : "",
+        "annotations2" : "",
+        "hitType"      : "",
+        }
+
+    # Parse data from paralogs report file
+    with open(paralogFile,"r") as PARALOG_H:
+        for pLine in PARALOG_H:
+            pLine = pLine.rstrip('\r\n')
+
+            # Classify each line once, by its literal prefix or keyword
+            # Section lines ("# PARALOGS for genome ...", "# Gene Paralogs") begin with '#';
+            # data lines begin with their field label. Skip all other lines.
+            if not pLine:
+                continue
+
+            # Determine which genome's paralogs are being reported
+            elif pLine[0] == '#':
+                if 'PARALOGS' in pLine:
+                    match_path = p_paralogPath.search(pLine)
+                    genomePathString = match_path.group(1)
+                    if genomePathString:
+                        genomeFileString = os.path.basename(genomePathString)
+                        (genomeName,extension) = genomeFileString.split('.')
+                        dataArgs["genome1"] = genomeName
+                    else:
+                        if PHATE_WARNINGS:
+                            print("genomics_compareGenomes says, WARNING: Cannot read genome path from paralogs file,",paralogFile)
+
+                # Determine whether it's a gene versus protein paralog
+                elif 'Gene Paralogs' in pLine:
+                    GENE = True; PROTEIN = False
+                elif 'Protein Paralogs' in pLine:
+                    PROTEIN = True; GENE = False
+
+            # Parse paralog data; add to paralog list 
+            elif pLine.startswith('query:'):
+                fields = pLine.split('\t')
+                queryString        = fields[0]
+                subjectString      = fields[1]
+                hitType            = fields[2]
+                identity           = fields[3]
+                alignLength        = fields[4]
+                mismatches         = fields[5]
+                gapopens           = fields[6]
+                queryStartEnd      = fields[7]
+                subjectStartEnd    = fields[8]
+                (preamble,query)   = queryString.split(':')
+                (preamble,subject) = subjectString.split(':')
+                if GENE:
+                    dataArgs["gene1"]    = query
+                    dataArgs["gene2"]    = subject
+                    dataArgs["hitType"]  = "gene_paralog"
+                elif PROTEIN:
+                    dataArgs["protein1"] = query
+                    dataArgs["protein2"] = subject
+                    dataArgs["hitType"]  = "protein_paralog"
+
+            # Read coverage (last data line per paralog) and add this paralog to genome's paralogList; Then, reset
+            elif pLine.startswith('coverage:'):
+                (preamble,coverage) = pLine.split(':',1)
+
+                paralogList.append(dataArgs)
+
+                # Reset data structures
+                dataArgs = { 
+                    "genome1"      : "",   # the fasta file name
+                    "genome2"      : "",   # not used for paralog hit 
+                    "contig1"      : "",   
+                    "contig2"      : "",   
+                    "gene1"        : "",
+                    "gene2"        : "",
+                    "protein1"     : "",
+                    "protein2"     : "",
+                    "geneCall1"    : "",
+                    "geneCall2"    : "",
+                    "annotations1" : "",
+                    "annotations2" : "",
+                    "hitType"      : "",
+                    }
+                GENE       = False
+                PROTEIN    = False
+                genomeName = ""
+                query      = ""
+                subject    = ""
+                coverage   = 0.0
+
+    return paralogList
+
+# Function readResultsDirectory parses one CGP Results directory's report and paralogs files; it only reads
+# files, so comparison.parseReportFiles can run it over the directories in worker processes.
+def readResultsDirectory(job):
+    (genome1,genome2,reportFile,paralogFile) = job
+    return (readBestHits(genome1,genome2,reportFile), readParalogs(paralogFile))
+
+# Function makeIdentifier builds a gene/protein's unique identifier (genome:contig:name). The same identifier is
+# stored on the object and in other objects' hit, paralog and homology lists, so it is interned: every copy
+# shares one string object, and set/dict lookups on identifiers compare by pointer first.
+def makeIdentifier(genomeName,contigName,name):
+    return sys.intern(genomeName + ':' + contigName + ':' + name)
+
+
 # Class comparison organizes all genomic data and performs comparisons, ultimately yielding
 #   homology groups for each gene/protein in a reference genome.
 class comparison(object):
@@ -205,16 +425,16 @@ class comparison(object):
         self.referenceGenome       = ""             # name of genome assigned as the reference
         self.genomeCount           = 0              # number of genomes in set
         self.genomeList            = []             # set of genome class objects
-        self.commonCore_gene       = []             # list of genes that are common among all genomes: all around mutual best hits
-        self.commonCore_protein    = []             # list of protein that are common among all genomes: all around mutual best hits
+        self.genomeByName          = {}             # genome class objects keyed by genome name
+        self.referenceGenomeList   = []             # genome class objects flagged isReference; see updateReferenceGenomeList
+        self.genomesByDirectory    = {}             # (genome1,genome2) names keyed by Results directory
+        self.commonCore_gene       = {}             # per reference genome name, list of genes that are common among all genomes: all around mutual best hits
+        self.commonCore_protein    = {}             # per reference genome name, list of protein that are common among all genomes: all around mutual best hits
         self.geneHomologyGroups    = []             # closely related genes for hmmbuild (list of lists) #*** CHECK THIS - is this used at comparison level?
         self.proteinHomologyGroups = []             # closely related proteins for hmmbuild (list of lists) #*** CHECK THIS
-        # Templates
-        self.genomeTemplate        = genome()
-        self.geneTemplate          = gene_protein()
-        self.geneTemplate.type     = "gene"
-        self.proteinTemplate       = gene_protein()
-        self.proteinTemplate.type  = "protein"
+        # Empty objects returned when a paralog lookup finds no genome
+        self.geneTemplate          = gene_protein("gene")
+        self.proteinTemplate       = gene_protein("protein")
 
     def performComparison(self):
 
@@ -228,6 +448,7 @@ class comparison(object):
         if PHATE_PROGRESS:
             print("genomics_compareGenomes says, Computing homology groups.")
         self.computeHomologyGroups()
+        self.computeCoreGenome()
 
         if PHATE_PROGRESS:
             print("genomics_compareGenomes says, Creating homology group fasta files.")
@@ -255,18 +476,10 @@ class comparison(object):
         return
 
     def readDirectories(self):
-        dirList = []
-        # Query Results files in CGP Results directory
-        command = "ls " + CGP_RESULTS_DIR
-        proc = subprocess.Popen(command, stdout=subprocess.PIPE, shell=True)
-        (rawresult, err) = proc.communicate()
-        result = rawresult.decode('utf-8')
-        fileList = str(result).split('\n')   # Python3
-
-        for filename in fileList:
-            match_resultdir = re.search('Results_',filename)
-            if match_resultdir:
-                dirList.append(filename)
+        # Query Results directories in CGP Results directory; sorted, as ls listed them
+        with os.scandir(CGP_RESULTS_DIR) as entries:
+            dirList = sorted(entry.name for entry in entries
+                             if entry.name.startswith('Results_') and entry.is_dir())
 
         if PHATE_MESSAGES:
             print("genomics_compareGenomes says, The following directories have been read:")
@@ -277,26 +490,33 @@ class comparison(object):
     def parseDirectories(self,dirList):
         # Walk through the CGP output directory; determine which genomes were processed; add them to a non-redundant list
         genomeList = []; genomeFastaList = []
+        genomeSet  = set(); genomeFastaSet = set()   # membership tests; the lists keep the order genomes were listed in
         for directory in dirList:
             cgp_directory = os.path.join(CGP_RESULTS_DIR,directory)
             if PHATE_PROGRESS:
                 print("genomics_compareGenomes says, Preparing to load data from directory,",cgp_directory)
 
-            # Read log file; determine two genomes
+            # Read log file; determine two genomes, and which is genome1, genome2
+            genome1 = ""; genome2 = ""
             CGP_LOG = os.path.join(cgp_directory,CGP_LOG_FILE)
-            cgpLog = open(CGP_LOG,'r')
-            cLines = cgpLog.read().splitlines()
-            for cLine in cLines:
-                match_fileLine = re.search('genome\sfile',cLine)
-                if match_fileLine:
-                    (preamble,filePath) = cLine.split(': ')
-                    genomeFasta = os.path.basename(filePath)
-                    if genomeFasta not in genomeFastaList:
-                        genomeFastaList.append(genomeFasta)
-                    (genome,extension) = genomeFasta.split('.')
-                    if genome not in genomeList:
-                        genomeList.append(genome)
-            cgpLog.close()
+            with open(CGP_LOG,'r') as cgpLog:
+                for cLine in cgpLog:
+                    cLine = cLine.rstrip('\r\n')
+                    if cLine.startswith('genome file'):
+                        (preamble,filePath) = cLine.split(': ')
+                        genomeFasta = os.path.basename(filePath)
+                        if genomeFasta not in genomeFastaSet:
+                            genomeFastaSet.add(genomeFasta)
+                            genomeFastaList.append(genomeFasta)
+                        (genomeName,extension) = genomeFasta.split('.')
+                        if genomeName not in genomeSet:
+                            genomeSet.add(genomeName)
+                            genomeList.append(genomeName)
+                        if cLine.startswith('genome file #1:'):
+                            genome1 = genomeName
+                        elif cLine.startswith('genome file #2:'):
+                            genome2 = genomeName
+            self.genomesByDirectory[directory] = (genome1,genome2)
 
             # First genome listed is the reference (was listed first in user's config file)
             if genomeList:
@@ -307,12 +527,14 @@ class comparison(object):
 
         # Create genome objects, one for each genome found in the CGP output directory
         for i in range(0,len(genomeList)):
-            nextGenome = copy.deepcopy(self.genomeTemplate)
+            nextGenome = genome()
             nextGenome.name = genomeList[i]
             if nextGenome.name == self.referenceGenome:
                 nextGenome.isReference = True
             nextGenome.file = genomeFastaList[i]
             self.genomeList.append(nextGenome)
+            self.genomeByName[nextGenome.name] = nextGenome
+        self.updateReferenceGenomeList()
 
         # Walk through .report files, add mutual & singular best hits, loners
         if PHATE_PROGRESS:
@@ -326,248 +548,89 @@ class comparison(object):
         if PHATE_PROGRESS:
             print("genomics_compareGenomes says, Parsing Report files.")
         # Load data for mutual and singular best hits and loners for all CGP binary genome comparisons.
-        for i in range(0,len(dirList)):
-            directory = dirList[i]
+        # Each directory's files are parsed independently (in parallel, if there are several); the hits
+        # are then recorded into the genome objects here, in directory order.
+        jobList = []
+        for directory in dirList:
             (genome1,genome2) = self.findGenomes(directory)
             reportFile  = os.path.join(CGP_RESULTS_DIR,directory,CGP_REPORT_FILE)
             paralogFile = os.path.join(CGP_RESULTS_DIR,directory,CGP_PARALOG_FILE)
+            jobList.append((genome1,genome2,reportFile,paralogFile))
+
+        if len(jobList) > 1:
+            parse_pool = Pool(min(os.cpu_count(),len(jobList)))
+            resultList = parse_pool.imap(readResultsDirectory, jobList)
+        else:
+            parse_pool = None
+            resultList = map(readResultsDirectory, jobList)
+
+        for (job,(hitList,paralogList)) in zip(jobList,resultList):
             if PHATE_PROGRESS:
-                print("genomics_compareGenomes says, Parsing report file",reportFile,"for mutual and singular best hits, and loners.")
-            self.loadBestHits(genome1,genome2,reportFile)
-            self.loadParalogs(paralogFile)
+                print("genomics_compareGenomes says, Parsing report file",job[2],"for mutual and singular best hits, and loners.")
+            for dataArgs in hitList:
+                self.addHit2genome(dataArgs)
+            self.addParalogs2genomes(paralogList)
+
+        if parse_pool:
+            parse_pool.close()
+            parse_pool.join()
         return
 
     def findGenomes(self,directory):
         # Determine which 2 genomes's data are listed in this directory,
-        # and which is genome1, genome2.
+        # and which is genome1, genome2. parseDirectories has normally recorded these already.
+        if directory in self.genomesByDirectory:
+            return self.genomesByDirectory[directory]
         genome1 = ""; genome2 = ""
         logFile = os.path.join(CGP_RESULTS_DIR,directory,CGP_LOG_FILE)
-        LOG_H = open(logFile,"r")
-        lLines = LOG_H.read().splitlines()
-        for lLine in lLines:
-            match_genome1 = re.search('genome\sfile\s#1:',lLine)
-            match_genome2 = re.search('genome\sfile\s#2:',lLine)
-            if match_genome1:
-                (preamble,genomePath) = lLine.split(': ')
-                genome1fasta = os.path.basename(genomePath)
-                (genome1,extension) = genome1fasta.split('.') 
-            if match_genome2:
-                (preamble,genomePath) = lLine.split(': ')
-                genome2fasta = os.path.basename(genomePath)
-                (genome2,extension) = genome2fasta.split('.') 
-        LOG_H.close()
+        with open(logFile,"r") as LOG_H:
+            for lLine in LOG_H:
+                lLine = lLine.rstrip('\r\n')
+                if lLine.startswith('genome file #1:'):
+                    (preamble,genomePath) = lLine.split(': ')
+                    genome1fasta = os.path.basename(genomePath)
+                    (genome1,extension) = genome1fasta.split('.') 
+                elif lLine.startswith('genome file #2:'):
+                    (preamble,genomePath) = lLine.split(': ')
+                    genome2fasta = os.path.basename(genomePath)
+                    (genome2,extension) = genome2fasta.split('.') 
         return(genome1,genome2)
 
-    # Method loadBestHits reads the CGP report file in a single pass, picking up mutual-best and singular-best hits
-    # plus loners. The hits are then forwarded to method addhit2genome for recording in the genome's gene_protein
-    # data structure.
     def loadBestHits(self,genome1,genome2,reportFile):
-        PROTEIN = False; hitCount = 0
-        REPORT_H = open(reportFile,"r")
-        rLines = REPORT_H.read().splitlines()
-
-        # Select and process mutual-best-hit data lines
-        # Gene hits are loaded first, then protein
-        for rLine in rLines:
-            fields = []; genomeNum = ""; hitType = ""
-            # Skip lines not to be processed in this method
-            match_comment  = re.search('^#',rLine)
-            match_protein  = re.search('^#PROTEIN\sHITS',rLine)
-            match_dataLine = re.search('^\d+',rLine)
-            if match_protein: 
-                PROTEIN = True  # Prepare for loading protein hits next
-                continue
-            if match_comment:
-                continue
-            if match_dataLine:
-                fields = rLine.split('\t')
-                (genomeNum,hitType) = fields[GENOME_TYPE].split('_')
-            else:
-                if PHATE_WARNINGS:
-                    print("genomics_compareGenomes says, WARNING: expected dataLine: ",rLine)
-                    continue
-            # Data structure for passing parameters to self.addHit2genome()
-            dataArgs = { 
-                "genome1"      : genome1,   # the fasta file name without extension
-                "genome2"      : genome2,   # the fasta file name without extension
-                "contig1"      : "",
-                "contig2"      : "",
-                "gene1"        : "",
-                "gene2"        : "",
-                "protein1"     : "",
-                "protein2"     : "",
-                "geneCall1"    : "",
-                "geneCall2"    : "",
-                "annotations1" : "",
-                "annotations2" : "",
-                "hitType"      : "",
-                "hitFlavor"    : "",
-                }
-
-            # Prepare arguments for passing to addHit2genome method
-            if genomeNum == "genome1":
-                dataArgs["hitType"] = hitType + '1'
-            elif genomeNum == "genome2":
-                dataArgs["hitType"] = hitType + '2'
-            else:
-                if PHATE_WARNINGS:
-                    print("genomics_compareGenomes says, WARNING: Unrecognized GENOME_TYPE")
-
-            # Record data from reportFile dataline
-            # Fields pertaining to gene or protein
-            dataArgs["contig1"]          = fields[G1_CONTIG]
-            dataArgs["contig2"]          = fields[G2_CONTIG]
-            dataArgs["annotations1"]     = fields[G1_ANNOTATIONS]
-            if dataArgs["annotations1"] != "":
-                dataArgs["geneCall1"]    = self.getGeneCallString(fields[G1_ANNOTATIONS]) 
-            dataArgs["annotations2"]     = fields[G2_ANNOTATIONS]
-            if dataArgs["annotations2"] != "":
-                dataArgs["geneCall2"]    = self.getGeneCallString(fields[G2_ANNOTATIONS]) 
-
-            # Protein- and gene-specific fields
-            if PROTEIN:
-                dataArgs["hitFlavor"]    = "protein"
-                dataArgs["protein1"]     = fields[G1_HEADER]
-                dataArgs["protein2"]     = fields[G2_HEADER]
-            else: # gene
-                dataArgs["hitFlavor"]    = "gene"
-                dataArgs["gene1"]        = fields[G1_HEADER]
-                dataArgs["gene2"]        = fields[G2_HEADER]
-
-            # Insert data record into genome object
+        for dataArgs in readBestHits(genome1,genome2,reportFile):
             self.addHit2genome(dataArgs)
-
-        REPORT_H.close()
         return
 
     def loadParalogs(self,paralogFile):
-        # Select and process mutual-best-hit data lines
-        fields = []; genomeNum = ""; paralogType = ""; genomeName = ""
-        GENE = False; PROTEIN = False
-        query = ""; subject = ""
-
-        # First, reset dataArgs data structure, for passing parameters to self.addHit2genome
-        dataArgs = { 
-            "genome1"      : "",   # the fasta file name
-            "genome2"      : "",   
-            "contig1"      : "",   
-            "contig2"      : "",   
-            "gene1"        : "",
-            "gene2"        : "",
-            "protein1"     : "",
-            "protein2"     : "",
-            "geneCall1"    : "",
-            "geneCall2"    : "",
-            "annotations1" : "",
-            "annotations2" : "",
-            "hitType"      : "",
-            }
-
-        # Parse data from paralogs report file
-        PARALOG_H = open(paralogFile,"r")
-        pLines = PARALOG_H.read().splitlines()
-        for pLine in pLines:
-
-            # Skip lines not to be processed in this method
-            match_genome   = re.search('PARALOGS',          pLine)
-            match_gene     = re.search('Gene\sParalogs',    pLine)
-            match_protein  = re.search('Protein\sParalogs', pLine)
-            match_header   = re.search('^header:',           pLine)
-            match_hitLine  = re.search('^query:',            pLine)
-            match_coverage = re.search('^coverage:',        pLine)
-
-            # Determine which genome's paralogs are being reported
-            if match_genome:
-                match_path = re.search('PARALOGS\sfor\sgenome\s(.*)',pLine)
-                genomePathString = match_path.group(1)
-                if genomePathString:
-                    genomeFileString = os.path.basename(genomePathString)
-                    (genomeName,extension) = genomeFileString.split('.')
-                    dataArgs["genome1"] = genomeName
-                else:
-                    if PHATE_WARNINGS:
-                        print("genomics_compareGenomes says, WARNING: Cannot read genome path from paralogs file,",paralogFile)
-
-            # Determine whether it's a gene versus protein paralog
-            elif match_gene:
-                GENE = True
-            elif match_protein:
-                PROTEIN = True
-
-            # Parse paralog data; add to paralog list 
-            elif match_hitLine:
-                fields = pLine.split('\t')
-                queryString        = fields[0]
-                subjectString      = fields[1]
-                hitType            = fields[2]
-                identity           = fields[3]
-                alignLength        = fields[4]
-                mismatches         = fields[5]
-                gapopens           = fields[6]
-                queryStartEnd      = fields[7]
-                subjectStartEnd    = fields[8]
-                (preamble,query)   = queryString.split(':')
-                (preamble,subject) = subjectString.split(':')
-                if GENE:
-                    dataArgs["gene1"]    = query
-                    dataArgs["gene2"]    = subject
-                    dataArgs["hitType"]  = "gene_paralog"
-                elif PROTEIN:
-                    dataArgs["protein1"] = query
-                    dataArgs["protein2"] = subject
-                    dataArgs["hitType"]  = "protein_paralog"
-
-            # Read coverage (last data line per paralog) and add this paralog to genome's paralogList; Then, reset
-            elif match_coverage:
-                (preamble,coverage) = match_coverage.group(0).split(':')
-
-                # Insert data record into genome object
-                self.addParalog2genome(dataArgs)
-
-                # Reset data structures
-                dataArgs = { 
-                    "genome1"      : "",   # the fasta file name
-                    "genome2"      : "",   # not used for paralog hit 
-                    "contig1"      : "",   
-                    "contig2"      : "",   
-                    "gene1"        : "",
-                    "gene2"        : "",
-                    "protein1"     : "",
-                    "protein2"     : "",
-                    "geneCall1"    : "",
-                    "geneCall2"    : "",
-                    "annotations1" : "",
-                    "annotations2" : "",
-                    "hitType"      : "",
-                    }
-                GENE       = False
-                PROTEIN    = False
-                genomeName = ""
-                query      = ""
-                subject    = ""
-                coverage   = 0.0
-
-        PARALOG_H.close()
+        for dataArgs in readParalogs(paralogFile):
+            self.addParalog2genome(dataArgs)
         return
 
     def addParalog2genome(self,dataArgs):
-        if "genome1" in dataArgs.keys():
-            genome = dataArgs["genome1"]
-        else:
+        genome = dataArgs.get("genome1")
+        if genome is None:
             if PHATE_WARNINGS:
                 print("genomics_compareGenomes says, WARNING: Expected genome1 name in addParalog2genome")
-                return
-        for genome_obj in self.genomeList:
-            if genome_obj.name == genome:
-                genome_obj.addParalog(dataArgs)
-                break
+            return
+        genome_obj = self.genomeByName.get(genome)
+        if genome_obj:
+            genome_obj.addParalog(dataArgs)
+        return
+
+    # Method addParalogs2genomes records a paralogs file's worth of paralog data, handing each genome its rows in bulk
+    def addParalogs2genomes(self,paralogList):
+        paralogsByGenome = {}
+        for dataArgs in paralogList:
+            paralogsByGenome.setdefault(dataArgs.get("genome1",""),[]).append(dataArgs)
+        for (genomeName,genomeParalogList) in paralogsByGenome.items():
+            genome_obj = self.genomeByName.get(genomeName)
+            if genome_obj:
+                genome_obj.ingestParalogs(genomeParalogList)
         return
 
     # Method getGeneCallString extracts the genecall name from the annotation string
     def getGeneCallString(self,inString):  
-        inList = ast.literal_eval(inString) # Convert string representation of a list to an actual list
-        geneCallString = inList[0][0]          # First element of the list is the genecall string
-        return geneCallString
+        return parseGeneCallString(inString)
 
     # Method addHit2genome inserts a new gene hit into a genome's geneList or proteinList, or records a gene as a
     # loner with respect to another genome. Note that every gene is assumed a loner until proven otherwise. Any 
@@ -575,27 +638,23 @@ class comparison(object):
     def addHit2genome(self,dataArgs): 
 
         # First, create gene or protein object
-        hitFlavor = "gene"; GENE = False; PROTEIN = False
+        GENE = False; PROTEIN = False
         gene1id = ""; gene2id = ""; protein1id = ""; protein2id = ""
-        gene_obj = None; protein_obj = None   # a gene_protein object (gene or protein template)
+        gene_obj = None; protein_obj = None   # a gene_protein object (gene or protein)
 
         # Create gene_protein object, according to flavor. hitFlavor is "gene" or "protein".
-        if "hitFlavor" in dataArgs.keys():
-            hitFlavor = dataArgs["hitFlavor"]
-        else:
-            if PHATE_WARNINGS:
-                print("genomics_compareGenomes says, WARNING: hitFlavor not specified")
-                return
+        hitFlavor = dataArgs.get("hitFlavor")
         if hitFlavor == "gene":
-            gene_obj = self.geneTemplate
             GENE = True
         elif hitFlavor == "protein":
-            protein_obj = self.proteinTemplate 
             PROTEIN = True
         else:
             if PHATE_WARNINGS:
-                print("genomics_compareGenomes says, WARNING: Unrecognized hitFlavor, ",dataArgs["hitFlavor"])
-                return
+                if hitFlavor is None:
+                    print("genomics_compareGenomes says, WARNING: hitFlavor not specified")
+                else:
+                    print("genomics_compareGenomes says, WARNING: Unrecognized hitFlavor, ",hitFlavor)
+            return
 
         MUTUAL = False; SINGULAR_ONE = False; SINGULAR_TWO = False; LONER_ONE = False; LONER_TWO = False
         # Data needed for "mutual" or "singular" hit entry
@@ -604,183 +663,168 @@ class comparison(object):
         # Compute unique identifiers for query and subject genes 
 
         # Determine type of hit and whether the query is genome1 versus genome2
-        match_mutual   = re.search("mutual",  dataArgs["hitType"])
-        match_singular = re.search("singular",dataArgs["hitType"])
-        match_loner    = re.search("loner",   dataArgs["hitType"])
-        match_query    = re.search("(\d)",    dataArgs["hitType"])
-        if match_mutual:  # mutual hit is always genome 1 as query
+        # hitType is "mutual", "singular" or "loner" suffixed with the query genome's number (1 or 2)
+        hitType        = dataArgs["hitType"]
+        match_singular = hitType.startswith('singular')
+        match_loner    = hitType.startswith('loner')
+        query_one      = hitType.endswith('1')
+        query_two      = hitType.endswith('2')
+        if hitType.startswith('mutual'):  # mutual hit is always genome 1 as query
             MUTUAL = True
-        if match_singular and match_query.group(1) == '1':
+        if match_singular and query_one:
             SINGULAR_ONE = True
-        if match_singular and match_query.group(1) == '2':
+        if match_singular and query_two:
             SINGULAR_TWO = True
-        if match_loner and match_query.group(1) == '1':
+        if match_loner and query_one:
             LONER_ONE = True
-        if match_loner and match_query.group(1) == '2':
+        if match_loner and query_two:
             LONER_TWO = True
 
         if GENE:
             if dataArgs["gene1"] != "":
                 genome1_obj = self.findGenomeObject(dataArgs["genome1"])
-                gene1id = dataArgs["genome1"] + ':' + dataArgs["contig1"] + ':' + dataArgs["gene1"]
+                gene1id = makeIdentifier(dataArgs["genome1"],dataArgs["contig1"],dataArgs["gene1"])
             if dataArgs["gene2"] != "":
                 genome2_obj = self.findGenomeObject(dataArgs["genome2"])
-                gene2id = dataArgs["genome2"] + ':' + dataArgs["contig2"] + ':' + dataArgs["gene2"]
+                gene2id = makeIdentifier(dataArgs["genome2"],dataArgs["contig2"],dataArgs["gene2"])
         elif PROTEIN:
             if dataArgs["protein1"] != "":
                 genome1_obj = self.findGenomeObject(dataArgs["genome1"])
-                protein1id = dataArgs["genome1"] + ':' + dataArgs["contig1"] + ':' + dataArgs["protein1"]
+                protein1id = makeIdentifier(dataArgs["genome1"],dataArgs["contig1"],dataArgs["protein1"])
             if dataArgs["protein2"] != "":
                 genome2_obj = self.findGenomeObject(dataArgs["genome2"])
-                protein2id = dataArgs["genome2"] + ':' + dataArgs["contig2"] + ':' + dataArgs["protein2"]
+                protein2id = makeIdentifier(dataArgs["genome2"],dataArgs["contig2"],dataArgs["protein2"])
 
         if MUTUAL or SINGULAR_ONE or LONER_ONE:
             # Search for query gene in genome1 (if exists)
             if GENE:
-                GENE_FOUND = False; NEW = False
-                for gene_obj in genome1_obj.geneList:
-                    if gene_obj.contigName == dataArgs["contig1"] and gene_obj.name == dataArgs["gene1"]:
-                        GENE_FOUND = True
-                        break
-                if not GENE_FOUND: 
+                NEW = False
+                geneKey = (dataArgs["contig1"],dataArgs["gene1"])
+                gene_obj = genome1_obj.geneIndex.get(geneKey)
+                if gene_obj is None: 
                     # Create and populate a new gene object
                     NEW = True
-                    gene_obj = copy.deepcopy(self.geneTemplate)
+                    gene_obj = gene_protein("gene")
                     gene_obj.name         = dataArgs["gene1"]
-                    gene_obj.type         = "gene"
                     gene_obj.identifier   = gene1id 
-                    gene_obj.cgpHeader    = dataArgs["gene1"]
+                    gene_obj.cgpHeader    = sys.intern(dataArgs["gene1"])
                     geneCallFields        = dataArgs["gene1"].split('/')   # format: cds#/strand/start/stop/
                     (cds,geneNumber)      = geneCallFields[0].split('cds')
                     gene_obj.number       = geneNumber
-                    gene_obj.parentGenome = dataArgs["genome1"]
-                    gene_obj.contigName   = dataArgs["contig1"]
+                    gene_obj.parentGenome = sys.intern(dataArgs["genome1"])
+                    gene_obj.contigName   = sys.intern(dataArgs["contig1"])
                     gene_obj.annotation   = dataArgs["annotations1"] 
 
                 # Add hit
                 if MUTUAL:
-                    gene_obj.mutualBestHitList.append(gene2id) 
-                    gene_obj.isLoner = False
+                    genome1_obj.recordMutualBestHit(gene_obj,gene2id,dataArgs["genome2"])
                 if SINGULAR_ONE:
-                    gene_obj.singularBestHitList.append(gene2id)
-                    gene_obj.isLoner = False
+                    gene_obj.addSingularBestHit(gene2id)
                 if LONER_ONE:
-                    gene_obj.lonerList.append(dataArgs["genome2"])   # To record a loner, append the name of the genome that this gene is a loner wrt
+                    gene_obj.addLoner(dataArgs["genome2"])   # To record a loner, append the name of the genome that this gene is a loner wrt
 
                 # If this gene object needed to be newly created, then add to geneList; else it's already there!
                 if NEW:
-                    genome1_obj.geneList.append(gene_obj)
+                    genome1_obj.addGene(gene_obj)
 
             elif PROTEIN:
-                PROTEIN_FOUND = False; NEW = False
-                for protein_obj in genome1_obj.proteinList:
-                    if protein_obj.contigName == dataArgs["contig1"] and protein_obj.name == dataArgs["protein1"]:
-                        PROTEIN_FOUND = True
-                        break
-                if not PROTEIN_FOUND: 
+                NEW = False
+                proteinKey = (dataArgs["contig1"],dataArgs["protein1"])
+                protein_obj = genome1_obj.proteinIndex.get(proteinKey)
+                if protein_obj is None: 
                     # Create and populate a new gene object
                     NEW = True
-                    protein_obj = copy.deepcopy(self.proteinTemplate)
+                    protein_obj = gene_protein("protein")
                     protein_obj.name         = dataArgs["protein1"]
-                    protein_obj.type         = "protein"
                     protein_obj.identifier   = protein1id 
-                    protein_obj.cgpHeader    = dataArgs["protein1"]
+                    protein_obj.cgpHeader    = sys.intern(dataArgs["protein1"])
                     proteinNameFields        = dataArgs["protein1"].split('/')  # format: cds#/strand/start/stop/
                     (cds,proteinNumber)      = proteinNameFields[0].split('cds')
                     protein_obj.number       = proteinNumber
-                    protein_obj.parentGenome = dataArgs["genome1"]
-                    protein_obj.contigName   = dataArgs["contig1"]
+                    protein_obj.parentGenome = sys.intern(dataArgs["genome1"])
+                    protein_obj.contigName   = sys.intern(dataArgs["contig1"])
                     protein_obj.annotation   = dataArgs["annotations1"] 
 
                 # Add hit
                 if MUTUAL:
-                    protein_obj.mutualBestHitList.append(protein2id) 
-                    protein_obj.isLoner = False
+                    genome1_obj.recordMutualBestHit(protein_obj,protein2id,dataArgs["genome2"])
                 if SINGULAR_ONE:
-                    protein_obj.singularBestHitList.append(protein2id)
-                    protein_obj.isLoner = False
+                    protein_obj.addSingularBestHit(protein2id)
                 if LONER_ONE:
-                    protein_obj.lonerList.append(dataArgs["genome2"])
+                    protein_obj.addLoner(dataArgs["genome2"])
 
                 # If this protein object needed to be newly created, then add to proteinList; else it's already there!
                 if NEW:
-                    genome1_obj.proteinList.append(protein_obj)
+                    genome1_obj.addProtein(protein_obj)
 
         if MUTUAL or SINGULAR_TWO or LONER_TWO:
             # Search for query gene in genome2 (if exists)
             if GENE:
-                GENE_FOUND = False; NEW = False
-                for gene_obj in genome2_obj.geneList:
-                    if gene_obj.contigName == dataArgs["contig2"] and gene_obj.name == dataArgs["gene2"]:
-                        GENE_FOUND = True
-                        break
-                if not GENE_FOUND: 
+                NEW = False
+                geneKey = (dataArgs["contig2"],dataArgs["gene2"])
+                gene_obj = genome2_obj.geneIndex.get(geneKey)
+                if gene_obj is None: 
                     # Create and populate a new gene object
                     NEW = True
-                    gene_obj = copy.deepcopy(self.geneTemplate)
+                    gene_obj = gene_protein("gene")
                     gene_obj.name         = dataArgs["gene2"]
-                    gene_obj.type         = "gene"
                     gene_obj.identifier   = gene2id 
-                    gene_obj.cgpHeader    = dataArgs["gene2"]
+                    gene_obj.cgpHeader    = sys.intern(dataArgs["gene2"])
                     geneCallFields        = dataArgs["gene2"].split('/')
                     (cds,geneNumber)      = geneCallFields[0].split('cds')
                     gene_obj.number       = geneNumber
-                    gene_obj.parentGenome = dataArgs["genome2"]
-                    gene_obj.contigName   = dataArgs["contig2"]
+                    gene_obj.parentGenome = sys.intern(dataArgs["genome2"])
+                    gene_obj.contigName   = sys.intern(dataArgs["contig2"])
                     gene_obj.annotation   = dataArgs["annotations2"] 
 
                 # Add hit
                 if MUTUAL:
-                    gene_obj.mutualBestHitList.append(gene1id) 
-                    gene_obj.isLoner = False
+                    genome2_obj.recordMutualBestHit(gene_obj,gene1id,dataArgs["genome1"])
                 if SINGULAR_TWO:
-                    gene_obj.singularBestHitList.append(gene1id)
-                    gene_obj.isLoner = False
+                    gene_obj.addSingularBestHit(gene1id)
                 if LONER_TWO:
-                    gene_obj.lonerList.append(dataArgs["genome1"])
+                    gene_obj.addLoner(dataArgs["genome1"])
                 if NEW:
-                    genome2_obj.geneList.append(gene_obj)
+                    genome2_obj.addGene(gene_obj)
 
             elif PROTEIN:
-                PROTEIN_FOUND = False; NEW = False
-                for protein_obj in genome2_obj.proteinList:
-                    if protein_obj.contigName == dataArgs["contig2"] and protein_obj.name == dataArgs["protein2"]:
-                        PROTEIN_FOUND = True
-                        break
-                if not PROTEIN_FOUND: 
+                NEW = False
+                proteinKey = (dataArgs["contig2"],dataArgs["protein2"])
+                protein_obj = genome2_obj.proteinIndex.get(proteinKey)
+                if protein_obj is None: 
                     # Create and populate a new gene object
                     NEW = True
-                    protein_obj = copy.deepcopy(self.proteinTemplate)
+                    protein_obj = gene_protein("protein")
                     protein_obj.name         = dataArgs["protein2"]
-                    protein_obj.type         = "protein"
                     protein_obj.identifier   = protein2id 
-                    protein_obj.cgpHeader    = dataArgs["protein2"]
+                    protein_obj.cgpHeader    = sys.intern(dataArgs["protein2"])
                     proteinNameFields        = dataArgs["protein2"].split('/')
                     (cds,proteinNumber)      = proteinNameFields[0].split('cds')
                     protein_obj.number       = proteinNumber
-                    protein_obj.parentGenome = dataArgs["genome2"]
-                    protein_obj.contigName   = dataArgs["contig2"]
+                    protein_obj.parentGenome = sys.intern(dataArgs["genome2"])
+                    protein_obj.contigName   = sys.intern(dataArgs["contig2"])
                     protein_obj.annotation   = dataArgs["annotations2"] 
 
                 # Add hit
                 if MUTUAL:
-                    protein_obj.mutualBestHitList.append(protein1id) 
-                    protein_obj.isLoner = False
+                    genome2_obj.recordMutualBestHit(protein_obj,protein1id,dataArgs["genome1"])
                 if SINGULAR_TWO:
-                    protein_obj.singularBestHitList.append(protein1id)
-                    protein_obj.isLoner = False
+                    protein_obj.addSingularBestHit(protein1id)
                 if LONER_TWO:
-                    protein_obj.lonerList.append(dataArgs["genome1"])
+                    protein_obj.addLoner(dataArgs["genome1"])
                 if NEW:
-                    genome2_obj.proteinList.append(protein_obj)
+                    genome2_obj.addProtein(protein_obj)
         return
 
-    def findGenomeObject(self,genomeName):
-        for genome_object in self.genomeList:
-            if genome_object.name == genomeName:
-                return genome_object
+    # Method updateReferenceGenomeList caches the reference genome(s) for the homology and report methods;
+    # call it again if any genome's isReference flag changes.
+    def updateReferenceGenomeList(self):
+        self.referenceGenomeList = [genome for genome in self.genomeList if genome.isReference]
         return
 
+    def findGenomeObject(self,genomeName):
+        return self.genomeByName.get(genomeName)
+
     def addMutualBestHit(self,hitList,hit,item1,item2,item3,item4,item5):
         print("genomics_comparGenomes says, Adding hit ",hit," to mutualBestHitList:")
         print("other data: ",item1,' ',item2,' ',item3,' ',item4,' ',item5)
@@ -816,62 +860,74 @@ class comparison(object):
     def computeHomologyGroups(self):
         # Compute homology groups  for each reference gene/protein by combining homologous genes 
         # laterally (across genomes) and vertically (paralogs); save to reference genome object.
-        refGeneList    = []  # Names of reference genes that have been combined into a group 
-        refProteinList = []  # Names of reference proteins that have been combined into a group 
-        for genome in self.genomeList:
-            if genome.isReference:
+        refGeneList    = set()  # Names of reference genes that have been combined into a group 
+        refProteinList = set()  # Names of reference proteins that have been combined into a group 
+        for genome in self.referenceGenomeList:
+            # Index the reference genes/proteins by identifier for the paralog lookups below
+            geneById = {}; proteinById = {}
+            for gene in genome.geneList:
+                geneById.setdefault(gene.identifier,gene)
+            for protein in genome.proteinList:
+                proteinById.setdefault(protein.identifier,protein)
 
-                # Compute gene homology lists
-                for gene in genome.geneList:
-                    if gene.identifier in refGeneList: # Already processed this gene
-                        continue 
-                    else:
-                        # Account for the gene itself
-                        refGeneList.append(gene.identifier)
-                        # Account for each mutual best hit
-                        for homolog in gene.mutualBestHitList:
-                            gene.homologyList.append(homolog)
-                        # Account for each singular best hit
-                        for homolog in gene.singularBestHitList:
-                            gene.homologyList.append(homolog)
-                        # Account for each paralog of the gene itself
-                        for homolog in gene.paralogList:
-                            gene.homologyList.append(homolog)
-                            refGeneList.append(homolog) # record here so doesn't provoke another homology group 
-                            # Account for each mutual and singular best hit of each paralog
+            # Compute gene homology lists
+            for gene in genome.geneList:
+                if gene.identifier in refGeneList: # Already processed this gene
+                    continue 
+                else:
+                    # Account for the gene itself
+                    refGeneList.add(gene.identifier)
+                    # Account for each mutual best hit
+                    gene.homologyList.extend(gene.mutualBestHitList)
+                    # Account for each singular best hit
+                    gene.homologyList.extend(gene.singularBestHitList)
+                    # Account for each paralog of the gene itself
+                    for homolog in gene.paralogList:
+                        gene.homologyList.append(homolog)
+                        refGeneList.add(homolog) # record here so doesn't provoke another homology group 
+                        # Account for each mutual and singular best hit of each paralog
+                        paralog_obj = geneById.get(homolog)
+                        if paralog_obj is None:
                             paralog_obj = self.findGeneParalog(genome.name,homolog)
-                            for gHomolog in paralog_obj.mutualBestHitList:
-                                gene.homologyList.append(gHomolog)
-                            for gHomolog in paralog_obj.singularBestHitList:
-                                gene.homologyList.append(gHomolog)
-
-                # Compute protein homology lists
-                for protein in genome.proteinList:
-                    if protein.identifier in refProteinList: # Already processed this gene
-                        continue 
-                    else:
-                        # Account for the protein itself
-                        refProteinList.append(protein.identifier)
-                        # Account for each mutual best hit
-                        for homolog in protein.mutualBestHitList:
-                            protein.homologyList.append(homolog)
-                        # Account for each singular best hit
-                        for homolog in protein.singularBestHitList:
-                            protein.homologyList.append(homolog)
-                        # Account for each paralog of the protein itself
-                        for homolog in protein.paralogList:
-                            protein.homologyList.append(homolog)
-                            refProteinList.append(homolog) # record here so doesn't provoke another homology group
-                            # Account for each mutual and singular best hit of each paralog
+                        gene.homologyList.extend(paralog_obj.mutualBestHitList)
+                        gene.homologyList.extend(paralog_obj.singularBestHitList)
+
+            # Compute protein homology lists
+            for protein in genome.proteinList:
+                if protein.identifier in refProteinList: # Already processed this gene
+                    continue 
+                else:
+                    # Account for the protein itself
+                    refProteinList.add(protein.identifier)
+                    # Account for each mutual best hit
+                    protein.homologyList.extend(protein.mutualBestHitList)
+                    # Account for each singular best hit
+                    protein.homologyList.extend(protein.singularBestHitList)
+                    # Account for each paralog of the protein itself
+                    for homolog in protein.paralogList:
+                        protein.homologyList.append(homolog)
+                        refProteinList.add(homolog) # record here so doesn't provoke another homology group
+                        # Account for each mutual and singular best hit of each paralog
+                        paralog_obj = proteinById.get(homolog)
+                        if paralog_obj is None:
                             paralog_obj = self.findProteinParalog(genome.name,homolog)
-                            for pHomolog in paralog_obj.mutualBestHitList:
-                                protein.homologyList.append(pHomolog)
-                            for pHomolog in paralog_obj.singularBestHitList:
-                                protein.homologyList.append(pHomolog)
+                        protein.homologyList.extend(paralog_obj.mutualBestHitList)
+                        protein.homologyList.extend(paralog_obj.singularBestHitList)
         if PHATE_PROGRESS:
             print("genomics_compareGenomes says, Homology group computation complete.")
         return
 
+    # Method computeCoreGenome records, for each reference genome, the genes/proteins whose mutual best hits
+    # span all other genomes; the core genome writers list these.
+    def computeCoreGenome(self):
+        # Core: a mutual best hit in every other genome
+        otherGenomeCount = len(self.genomeList) - 1
+        self.commonCore_gene = {}; self.commonCore_protein = {}
+        for genome in self.referenceGenomeList:
+            self.commonCore_gene[genome.name]    = [gene for gene in genome.geneList if len(gene.mutualBestHitByGenome) == otherGenomeCount]
+            self.commonCore_protein[genome.name] = [protein for protein in genome.proteinList if len(protein.mutualBestHitByGenome) == otherGenomeCount]
+        return
+
     def findGeneParalog(self,genomeName,geneIdentifier):
         gene_obj = self.geneTemplate
         for genome in self.genomeList:
@@ -894,88 +950,86 @@ class comparison(object):
     def createGeneHomologyFastaFiles(self,directory='./'):
         geneFasta   = ""
         groupNumber = 0
-        for genome in self.genomeList:
-            if genome.isReference:
-                for gene in genome.geneList:
-
-                    if gene.homologyList:
-                        # Construct full path/filename string for next homology group fasta file name
-                        groupNumber += 1
-                        homFileName = HOMOLOGY_PREFIX + str(groupNumber) + '.fnt' 
-                        nextHomologyFastaFile = os.path.join(directory,homFileName)
-                        # Get fasta sequence for this reference protein
-                        filePathName = self.getGeneFile(genome.name) 
-                        geneSeq = self.getSequence(gene.name,filePathName)
-                        FILE_H = open(nextHomologyFastaFile,'w')
-                        fastaString = '>' + gene.identifier + '\n' + geneSeq + '\n'
-                        FILE_H.write("%s" % (fastaString))
+        for genome in self.referenceGenomeList:
+            for gene in genome.geneList:
 
-                        # Get fasta sequence for each member of this reference genes homology group 
-                        for seqID in gene.homologyList:
-                            (genomeName,contigName,cgpHeader) = seqID.split(':')
-                            filePathName = self.getGeneFile(genomeName)
-                            geneFasta = self.getSequence(cgpHeader,filePathName)
-                            fastaString = '>' + seqID + '\n' + geneSeq + '\n'
-                            FILE_H.write("%s" % (fastaString))
-                        FILE_H.close()
+                if gene.homologyList:
+                    # Construct full path/filename string for next homology group fasta file name
+                    groupNumber += 1
+                    homFileName = HOMOLOGY_PREFIX + str(groupNumber) + '.fnt' 
+                    nextHomologyFastaFile = os.path.join(directory,homFileName)
+                    # Get fasta sequence for this reference protein
+                    filePathName = self.getGeneFile(genome.name) 
+                    geneSeq = self.getSequence(gene.name,filePathName)
+                    FILE_H = open(nextHomologyFastaFile,'w')
+                    fastaString = '>' + gene.identifier + '\n' + geneSeq + '\n'
+                    FILE_H.write("%s" % (fastaString))
+
+                    # Get fasta sequence for each member of this reference genes homology group 
+                    for seqID in gene.homologyList:
+                        (genomeName,contigName,cgpHeader) = seqID.split(':')
+                        filePathName = self.getGeneFile(genomeName)
+                        geneFasta = self.getSequence(cgpHeader,filePathName)
+                        fastaString = '>' + seqID + '\n' + geneSeq + '\n'
+                        FILE_H.write("%s" % (fastaString))
+                    FILE_H.close()
         return geneFasta
 
     # Method createProteinHomologyFastaFiles creates not only homology fasta files, but also annotation files
     def createProteinHomologyFastaFiles(self,directory='./'):
         groupNumber  = 0
         # Identify reference genome and construct homology fasta files and homology annotation files
-        for genome in self.genomeList:
-            if genome.isReference:  # Reference genome is basis for homology groups
-                for protein in genome.proteinList:
-                    # Walk through protein list, gather fasta sequences for each homology group
-                    if protein.homologyList:  # Remember that homology groups include paralogs and their correspondences
-
-                        # Construct full path/filename string for next homology group fasta file name
-                        groupNumber += 1
-                        homFileName = HOMOLOGY_PREFIX + str(groupNumber) + '.faa'          
-                        nextHomologyFastaFile = os.path.join(directory,homFileName) 
-
-                        # Construct full path/filename string for next homology group annotation file name
-                        annotFileName = HOMOLOGY_ANNOT_PREFIX + str(groupNumber) + '.annot'
-                        nextHomologyAnnotFile = os.path.join(directory,annotFileName)
-
-                        # Open fasta and annotation files
-                        FASTA_FILE_H = open(nextHomologyFastaFile,'w')
-                        ANNOT_FILE_H = open(nextHomologyAnnotFile,'w')
-
-                        # Get fasta sequence for this reference protein and write to file
-                        filePathName = self.getProteinFile(genome.name) 
-                        proteinSeq = self.getSequence(protein.name,filePathName)
-                        fastaString = '>' + protein.identifier + '\n' + proteinSeq + '\n'
+        for genome in self.referenceGenomeList:  # Reference genome is basis for homology groups
+            for protein in genome.proteinList:
+                # Walk through protein list, gather fasta sequences for each homology group
+                if protein.homologyList:  # Remember that homology groups include paralogs and their correspondences
+
+                    # Construct full path/filename string for next homology group fasta file name
+                    groupNumber += 1
+                    homFileName = HOMOLOGY_PREFIX + str(groupNumber) + '.faa'          
+                    nextHomologyFastaFile = os.path.join(directory,homFileName) 
+
+                    # Construct full path/filename string for next homology group annotation file name
+                    annotFileName = HOMOLOGY_ANNOT_PREFIX + str(groupNumber) + '.annot'
+                    nextHomologyAnnotFile = os.path.join(directory,annotFileName)
+
+                    # Open fasta and annotation files
+                    FASTA_FILE_H = open(nextHomologyFastaFile,'w')
+                    ANNOT_FILE_H = open(nextHomologyAnnotFile,'w')
+
+                    # Get fasta sequence for this reference protein and write to file
+                    filePathName = self.getProteinFile(genome.name) 
+                    proteinSeq = self.getSequence(protein.name,filePathName)
+                    fastaString = '>' + protein.identifier + '\n' + proteinSeq + '\n'
+                    FASTA_FILE_H.write("%s" % (fastaString))
+
+                    # Get fasta sequence for each member of this reference protein's homology group and write to file
+                    for seqID in protein.homologyList:
+                        (genomeName,contigName,cgpHeader) = seqID.split(':')
+                        filePathName = self.getProteinFile(genomeName)
+                        proteinSeq = self.getSequence(cgpHeader,filePathName)
+                        fastaString = '>' + seqID + '\n' + proteinSeq + '\n'
                         FASTA_FILE_H.write("%s" % (fastaString))
 
-                        # Get fasta sequence for each member of this reference protein's homology group and write to file
-                        for seqID in protein.homologyList:
-                            (genomeName,contigName,cgpHeader) = seqID.split(':')
-                            filePathName = self.getProteinFile(genomeName)
-                            proteinSeq = self.getSequence(cgpHeader,filePathName)
-                            fastaString = '>' + seqID + '\n' + proteinSeq + '\n'
-                            FASTA_FILE_H.write("%s" % (fastaString))
-
-                        # Get annotation for this reference protein and write to file
-                        fullAnnotation = ast.literal_eval(protein.annotation)
-                        annotation = fullAnnotation[0][1:] 
-                        ANNOT_FILE_H.write("%s\t%s\n" % (protein.identifier,annotation))
-
-                        # Get annotation for each member of the reference protein's homology group and write to file
-                        for seqID in protein.homologyList:
-                            try:
-                                fullAnnotation = ast.literal_eval(self.getAnnotation(seqID,"protein"))
-                                annotation = fullAnnotation[0][1:]
-                            except:
-                                if PHATE_WARNINGS:
-                                    print("genomics_compareGenomes says, WARNING: No annotation found for ",seqID)
-                                annotation = "no annotation found"
-                            ANNOT_FILE_H.write("%s\t%s\n" % (seqID,annotation))
-
-                        # Clean up
-                        FASTA_FILE_H.close()
-                        ANNOT_FILE_H.close()
+                    # Get annotation for this reference protein and write to file
+                    fullAnnotation = ast.literal_eval(protein.annotation)
+                    annotation = fullAnnotation[0][1:] 
+                    ANNOT_FILE_H.write("%s\t%s\n" % (protein.identifier,annotation))
+
+                    # Get annotation for each member of the reference protein's homology group and write to file
+                    for seqID in protein.homologyList:
+                        try:
+                            fullAnnotation = ast.literal_eval(self.getAnnotation(seqID,"protein"))
+                            annotation = fullAnnotation[0][1:]
+                        except:
+                            if PHATE_WARNINGS:
+                                print("genomics_compareGenomes says, WARNING: No annotation found for ",seqID)
+                            annotation = "no annotation found"
+                        ANNOT_FILE_H.write("%s\t%s\n" % (seqID,annotation))
+
+                    # Clean up
+                    FASTA_FILE_H.close()
+                    ANNOT_FILE_H.close()
         return
 
     def getGeneFile(self,genomeName):
@@ -1058,132 +1112,113 @@ class comparison(object):
         return
 
     def checkUnique(self):
-        tempList = []
+        # genomeByName holds one object per name, so any surplus in genomeList is a duplicate
+        if len(self.genomeByName) == len(self.genomeList):
+            return
+        tempSet = set()
         for genome in self.genomeList:
-            if genome.name in tempList:
+            if genome.name in tempSet:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes genomes obj says, WARNING: ",genome.name," occurs more than once in genomes object.")
             else:
-                tempList.append(genome.name)
+                tempSet.add(genome.name)
         return
 
     #===== COMPARISON PRINT METHODS
 
     def writeCorrespondences2file(self,FILE_H):
-        for genome in self.genomeList:
-            if genome.isReference:
-                FILE_H.write("%s\n" % ("GENE CORRESPONDENCES"))
-                # For each reference gene, print non-redundant list of mutual or singular best hit wrt each other genome
-                for gene in genome.geneList:
-                    correspondenceList = []
-                    FILE_H.write("%s%s\n" % ("Genes corresponding to",gene.identifier))
-                    for hit in gene.mutualBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in gene.singularBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in correspondenceList:
-                        FILE_H.write("%s%s\n" % ("  ",hit))
-                FILE_H.write("%s\n" % ("PROTEIN CORRESPONDENCES"))
-                # For each reference protein, print non-redundant list of mutual or singular best hit wrt each other genome
-                for protein in genome.proteinList:
-                    correspondenceList = []
-                    FILE_H.write("%s%s\n" % ("Proteins corresponding to",protein.identifier))
-                    for hit in protein.mutualBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in protein.singularBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in correspondenceList:
-                        FILE_H.write("%s%s\n" % ("  ",hit))
-        return
-
-    def writeCorrespondences(self):
-        for genome in self.genomeList:
-            if genome.isReference:
-                print("********** GENE CORRESPONDENCES **********")
-                # For each reference gene, print non-redundant list of mutual or singular best hit wrt each other genome
-                for gene in genome.geneList:
-                    correspondenceList = []
-                    print("Genes corresponding to",gene.identifier)
-                    for hit in gene.mutualBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in gene.singularBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in correspondenceList:
-                        print("  ",hit)
-                print("********** End Gene Correspondences")
-                print("********** PROTEIN CORRESPONDENCES **********")
-                # For each reference protein, print non-redundant list of mutual or singular best hit wrt each other genome
-                for protein in genome.proteinList:
-                    correspondenceList = []
-                    print("Genes corresponding to",protein.identifier)
-                    for hit in protein.mutualBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in protein.singularBestHitList:
-                        if hit not in correspondenceList:
-                            correspondenceList.append(hit)
-                    for hit in correspondenceList:
-                        print("  ",hit)
-                print("********** End Protein Correspondences")
+        for genome in self.referenceGenomeList:
+            FILE_H.write("%s\n" % ("GENE CORRESPONDENCES"))
+            # For each reference gene, print non-redundant list of mutual or singular best hit wrt each other genome
+            for gene in genome.geneList:
+                FILE_H.write("%s%s\n" % ("Genes corresponding to",gene.identifier))
+                # Non-redundant, in the order first seen (dict keys keep insertion order)
+                correspondenceList = dict.fromkeys(gene.mutualBestHitList + gene.singularBestHitList)
+                for hit in correspondenceList:
+                    FILE_H.write("%s%s\n" % ("  ",hit))
+            FILE_H.write("%s\n" % ("PROTEIN CORRESPONDENCES"))
+            # For each reference protein, print non-redundant list of mutual or singular best hit wrt each other genome
+            for protein in genome.proteinList:
+                FILE_H.write("%s%s\n" % ("Proteins corresponding to",protein.identifier))
+                correspondenceList = dict.fromkeys(protein.mutualBestHitList + protein.singularBestHitList)
+                for hit in correspondenceList:
+                    FILE_H.write("%s%s\n" % ("  ",hit))
+        return
+
+    def writeCorrespondences(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
+        for genome in self.referenceGenomeList:
+            print("********** GENE CORRESPONDENCES **********",file=buf)
+            # For each reference gene, print non-redundant list of mutual or singular best hit wrt each other genome
+            for gene in genome.geneList:
+                print("Genes corresponding to",gene.identifier,file=buf)
+                # Non-redundant, in the order first seen (dict keys keep insertion order)
+                correspondenceList = dict.fromkeys(gene.mutualBestHitList + gene.singularBestHitList)
+                for hit in correspondenceList:
+                    print("  ",hit,file=buf)
+            print("********** End Gene Correspondences",file=buf)
+            print("********** PROTEIN CORRESPONDENCES **********",file=buf)
+            # For each reference protein, print non-redundant list of mutual or singular best hit wrt each other genome
+            for protein in genome.proteinList:
+                print("Genes corresponding to",protein.identifier,file=buf)
+                correspondenceList = dict.fromkeys(protein.mutualBestHitList + protein.singularBestHitList)
+                for hit in correspondenceList:
+                    print("  ",hit,file=buf)
+            print("********** End Protein Correspondences",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeCoreGenome2file(self,FILE_H):
-        genomeCount = len(self.genomeList)
-        for genome in self.genomeList:
-            if genome.isReference:
-                count = 0
-                FILE_H.write("%s\n" % ("***** CORE GENOME: GENE"))
-                # For each reference gene that matches genes in all other genomes, list the gene set
-                for gene in genome.geneList:
-                    if len(gene.mutualBestHitList) == genomeCount-1:
-                        count += 1
-                        FILE_H.write("%s%s%s\n" % ("Gene Set #",count,':'))
-                        FILE_H.write("%s\n" % (gene.identifier))
-                        for hit in gene.mutualBestHitList:
-                            FILE_H.write("%s\n" % (hit))
-                count = 0
-                FILE_H.write("%s\n" % ("***** CORE GENOME: PROTEIN"))
-                # For each reference protein that matches proteins in all other genomes, list the protein set
-                for protein in genome.proteinList:
-                    if len(protein.mutualBestHitList) == genomeCount-1:
-                        count += 1
-                        FILE_H.write("%s%s%s\n" % ("Protein Set #",count,':'))
-                        FILE_H.write("%s\n" % (protein.identifier))
-                        for hit in protein.mutualBestHitList:
-                            FILE_H.write("%s\n" % (hit))
-        return
-
-    def writeCoreGenome(self):
-        genomeCount = len(self.genomeList)
+        if not self.commonCore_gene:
+            self.computeCoreGenome()
+        for genome in self.referenceGenomeList:
+            count = 0
+            FILE_H.write("%s\n" % ("***** CORE GENOME: GENE"))
+            # For each reference gene that matches genes in all other genomes, list the gene set
+            for gene in self.commonCore_gene[genome.name]:
+                count += 1
+                FILE_H.write("%s%s%s\n" % ("Gene Set #",count,':'))
+                FILE_H.write("%s\n" % (gene.identifier))
+                for hit in gene.mutualBestHitList:
+                    FILE_H.write("%s\n" % (hit))
+            count = 0
+            FILE_H.write("%s\n" % ("***** CORE GENOME: PROTEIN"))
+            # For each reference protein that matches proteins in all other genomes, list the protein set
+            for protein in self.commonCore_protein[genome.name]:
+                count += 1
+                FILE_H.write("%s%s%s\n" % ("Protein Set #",count,':'))
+                FILE_H.write("%s\n" % (protein.identifier))
+                for hit in protein.mutualBestHitList:
+                    FILE_H.write("%s\n" % (hit))
+        return
+
+    def writeCoreGenome(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
+        if not self.commonCore_gene:
+            self.computeCoreGenome()
         count = 0
-        for genome in self.genomeList:
-            if genome.isReference:
-                print("********** CORE GENOME: GENE **********")
-                # For each reference gene that matches genes in all other genomes, list the gene set
-                for gene in genome.geneList:
-                    if len(gene.mutualBestHitList) == genomeCount-1:
-                        count += 1
-                        print("Gene Set #",count,':')
-                        print(gene.identifier)
-                        for hit in gene.mutualBestHitList:
-                            print(hit)
-                print("********** End Core Genome: GENE **********")
-                print("********** CORE GENOME: PROTEIN **********")
-                # For each reference protein that matches protein in all other genomes, list the protein set
-                for protein in genome.proteinList:
-                    if len(protein.mutualBestHitList) == genomeCount-1:
-                        count += 1
-                        print("Protein Set #",count,':')
-                        print(protein.identifier)
-                        for hit in protein.mutualBestHitList:
-                            print(hit)
-                print("********** End Core Genome: PROTEIN **********")
+        for genome in self.referenceGenomeList:
+            print("********** CORE GENOME: GENE **********",file=buf)
+            # For each reference gene that matches genes in all other genomes, list the gene set
+            for gene in self.commonCore_gene[genome.name]:
+                count += 1
+                print("Gene Set #",count,':',file=buf)
+                print(gene.identifier,file=buf)
+                for hit in gene.mutualBestHitList:
+                    print(hit,file=buf)
+            print("********** End Core Genome: GENE **********",file=buf)
+            print("********** CORE GENOME: PROTEIN **********",file=buf)
+            # For each reference protein that matches protein in all other genomes, list the protein set
+            for protein in self.commonCore_protein[genome.name]:
+                count += 1
+                print("Protein Set #",count,':',file=buf)
+                print(protein.identifier,file=buf)
+                for hit in protein.mutualBestHitList:
+                    print(hit,file=buf)
+            print("********** End Core Genome: PROTEIN **********",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeMutualBestHitList2file(self,FILE_H):
@@ -1205,20 +1240,22 @@ class comparison(object):
                 protein.writeMutualBestHitList2file(FILE_H)
         return
 
-    def writeMutualBestHitList(self):
-        for genome in self.genomeList:
-            if genome.isReference:
-                print("************** ",genome.name," **************")
-                print("************** Mutual Best Hits: Gene ")
-                for gene in genome.geneList:
-                    print("** gene ",gene.identifier)
-                    gene.writeMutualBestHitList()
-                print("************** End of Mutual Best Hits List: Gene ")
-                print("************** Mutual Best Hits: Protein ")
-                for protein in genome.proteinList:
-                    print("** protein ",protein.identifier)
-                    protein.writeMutualBestHitList()
-                print("************** End of Mutual Best Hits List: Protein ")
+    def writeMutualBestHitList(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
+        for genome in self.referenceGenomeList:
+            print("************** ",genome.name," **************",file=buf)
+            print("************** Mutual Best Hits: Gene ",file=buf)
+            for gene in genome.geneList:
+                print("** gene ",gene.identifier,file=buf)
+                gene.writeMutualBestHitList(buf)
+            print("************** End of Mutual Best Hits List: Gene ",file=buf)
+            print("************** Mutual Best Hits: Protein ",file=buf)
+            for protein in genome.proteinList:
+                print("** protein ",protein.identifier,file=buf)
+                protein.writeMutualBestHitList(buf)
+            print("************** End of Mutual Best Hits List: Protein ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeSingularBestHitList2file(self,FILE_H):
@@ -1239,72 +1276,50 @@ class comparison(object):
                 protein.writeSingularBestHitList2file(FILE_H)
         return
 
-    def writeSingularBestHitList(self):
+    def writeSingularBestHitList(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
         for genome in self.genomeList:
-            print("************** Singular Best Hits for Genome, ",genome.name," **************")
-            print("************** Singular Best Hits ")
+            print("************** Singular Best Hits for Genome, ",genome.name," **************",file=buf)
+            print("************** Singular Best Hits ",file=buf)
             for gene in genome.geneList:
-                print("** gene ",gene.identifier)
-                gene.writeSingularBestHitList()
-            print("************** End of Singular Best Hits List ")
+                print("** gene ",gene.identifier,file=buf)
+                gene.writeSingularBestHitList(buf)
+            print("************** End of Singular Best Hits List ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeGeneCorrespondences2file(self,FILE_H):
-        for genome in self.genomeList:
-            if genome.isReference:
-                FILE_H.write("%s%s\n" % ("***** Gene and Protein Correspondences for reference genome, ",genome.name))
-                runningList = []
-                for gene in self.geneList:
-                    for hit in self.mutualBestHitList_gene:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    for hit in self.singularBestHitList_gene:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    FILE_H.write("%s%s%s\n" % ("genes corresponding to",gene.identifier,':'))
-                    for hit in runningList:
-                        FILE_H.write("%s%s\n" % ("     ",hit))
-                runningList = []
-                for protein in self.proteinList:
-                    for hit in self.mutualBestHitList_protein:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    for hit in self.singularBestHitList_protein:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    FILE_H.write("%s%s%s\n" % ("proteins corresponding to",protein.identifier,':'))
-                    for hit in runningList:
-                        FILE_H.write("%s%s\n" % ("     ",hit))
-        return
-
-    def writeGeneCorrespondences(self):
-        for genome in self.genomeList:
-            if genome.isReference:
-                runningList = []
-                print("********** Gene and Protein Correspondences for genome, ",genome.name," **********")
-                for gene in self.geneList:
-                    for hit in self.mutualBestHitList_gene:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    for hit in self.singularBestHitList_gene:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    print("genes corresponding to",gene.identifier,':')
-                    for hit in runningList:
-                        print("     ",hit)
-                print("********** End of gene correspondences ")
-                runningList = []
-                for protein in self.proteinList:
-                    for hit in self.mutualBestHitList_protein:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    for hit in self.singularBestHitList_protein:
-                        if hit not in runningList:
-                            runningList.append(hit)
-                    print("proteins corresponding to",protein.identifier,':')
-                    for hit in runningList:
-                        print("     ",hit)
-                print("********** End of protein correspondences ")
+        for genome in self.referenceGenomeList:
+            FILE_H.write("%s%s\n" % ("***** Gene and Protein Correspondences for reference genome, ",genome.name))
+            # Each gene's own mutual and singular best hits, non-redundant, in the order first seen
+            for gene in genome.geneList:
+                FILE_H.write("%s%s%s\n" % ("genes corresponding to",gene.identifier,':'))
+                for hit in dict.fromkeys(gene.mutualBestHitList + gene.singularBestHitList):
+                    FILE_H.write("%s%s\n" % ("     ",hit))
+            for protein in genome.proteinList:
+                FILE_H.write("%s%s%s\n" % ("proteins corresponding to",protein.identifier,':'))
+                for hit in dict.fromkeys(protein.mutualBestHitList + protein.singularBestHitList):
+                    FILE_H.write("%s%s\n" % ("     ",hit))
+        return
+
+    def writeGeneCorrespondences(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
+        for genome in self.referenceGenomeList:
+            print("********** Gene and Protein Correspondences for genome, ",genome.name," **********",file=buf)
+            # Each gene's own mutual and singular best hits, non-redundant, in the order first seen
+            for gene in genome.geneList:
+                print("genes corresponding to",gene.identifier,':',file=buf)
+                for hit in dict.fromkeys(gene.mutualBestHitList + gene.singularBestHitList):
+                    print("     ",hit,file=buf)
+            print("********** End of gene correspondences ",file=buf)
+            for protein in genome.proteinList:
+                print("proteins corresponding to",protein.identifier,':',file=buf)
+                for hit in dict.fromkeys(protein.mutualBestHitList + protein.singularBestHitList):
+                    print("     ",hit,file=buf)
+            print("********** End of protein correspondences ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeLonerList2file(self,FILE_H):
@@ -1320,19 +1335,22 @@ class comparison(object):
                     FILE_H.write("%s\n" % (protein.identifier))
         return
 
-    def writeLonerList(self):
+    def writeLonerList(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
         for genome in self.genomeList:
-            print("********** ",genome.name," **********")
-            print("********** Gene Loners ")
+            print("********** ",genome.name," **********",file=buf)
+            print("********** Gene Loners ",file=buf)
             for gene in genome.geneList:
                 if gene.isLoner:
-                    print(gene.identifier)
-            print("********** End of gene loner list ")
-            print("********** Protein Loners ")
+                    print(gene.identifier,file=buf)
+            print("********** End of gene loner list ",file=buf)
+            print("********** Protein Loners ",file=buf)
             for protein in genome.proteinList:
                 if protein.isLoner:
-                    print(protein.identifier)
-            print("********** End of protein loner list ")
+                    print(protein.identifier,file=buf)
+            print("********** End of protein loner list ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeParalogs2file(self,FILE_H):
@@ -1351,64 +1369,68 @@ class comparison(object):
                         FILE_H.write("%s\n" % (paralog))
         return
 
-    def writeParalogs(self):
+    def writeParalogs(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
         for genome in self.genomeList:
-            print("********** ",genome.name," **********")
-            print("********** Paralogs ")
+            print("********** ",genome.name," **********",file=buf)
+            print("********** Paralogs ",file=buf)
             for gene in genome.geneList:
                 if gene.paralogList:
-                    print("Paralog(s) for gene ",gene.identifier,":")
+                    print("Paralog(s) for gene ",gene.identifier,":",file=buf)
                     for paralog in gene.paralogList:
-                        print(paralog) 
+                        print(paralog,file=buf)
                 else:
-                    print("No paralogs for this gene")
+                    print("No paralogs for this gene",file=buf)
             for protein in genome.proteinList:
                 if protein.paralogList:
-                    print("Paralog(s) for protein ",protein.identifier,":")
+                    print("Paralog(s) for protein ",protein.identifier,":",file=buf)
                     for paralog in protein.paralogList:
-                        print(paralog)
+                        print(paralog,file=buf)
                 else:
-                    print("No paralogs for this protein")
-            print("********** End of paralogs list ")
+                    print("No paralogs for this protein",file=buf)
+            print("********** End of paralogs list ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def writeHomologyGroups2file(self,FILE_H):
         count = 0
-        for genome in self.genomeList:
-            if genome.isReference:
-                FILE_H.write("%s%s\n" % ("***** Homology Groups for Reference Genome, ",genome.name))
-                FILE_H.write("%s\n" % ("*** Gene Homology Groups"))
-                for gene in genome.geneList:
-                    if gene.homologyList:
-                        count += 1
-                        FILE_H.write("%s%s%s%s%s\n" % ("Homology group No. ",count," for gene ",gene.identifier,":"))
-                        FILE_H.write("%s%s\n" % ("  ",gene.homologyList))
-                FILE_H.write("%s\n" % ("*** Protein Homology Groups"))
-                for protein in genome.proteinList:
-                    if protein.homologyList:
-                        count += 1
-                        FILE_H.write("%s%s%s%s%s\n" % ("Homology group No. ",count," for protein ",protein.identifier,":"))
-                        FILE_H.write("%s%s\n" % ("  ",protein.homologyList))
-        return
-
-    def writeHomologyGroups(self):
+        for genome in self.referenceGenomeList:
+            FILE_H.write("%s%s\n" % ("***** Homology Groups for Reference Genome, ",genome.name))
+            FILE_H.write("%s\n" % ("*** Gene Homology Groups"))
+            for gene in genome.geneList:
+                if gene.homologyList:
+                    count += 1
+                    FILE_H.write("%s%s%s%s%s\n" % ("Homology group No. ",count," for gene ",gene.identifier,":"))
+                    FILE_H.write("%s%s\n" % ("  ",gene.homologyList))
+            FILE_H.write("%s\n" % ("*** Protein Homology Groups"))
+            for protein in genome.proteinList:
+                if protein.homologyList:
+                    count += 1
+                    FILE_H.write("%s%s%s%s%s\n" % ("Homology group No. ",count," for protein ",protein.identifier,":"))
+                    FILE_H.write("%s%s\n" % ("  ",protein.homologyList))
+        return
+
+    def writeHomologyGroups(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
         count = 0
-        for genome in self.genomeList:
-            if genome.isReference:
-                print("********** Homology Groups for Reference Genome, ",genome.name," **********")
-                print("********** Gene Homology Groups ")
-                for gene in genome.geneList:
-                    if gene.homologyList:
-                        count += 1
-                        print("Homology group No. ",count," for gene ",gene.identifier,":")
-                        print("  ",gene.homologyList)
-                print("********** End of Gene Homology Groups ")
-                for protein in genome.proteinList:
-                    if protein.homologyList:
-                        count += 1
-                        print("Homology group No. ",count," for protein ",protein.identifier,":")
-                        print("  ",protein.homologyList)
-                print("********** End of Protein Homology Groups ")
+        for genome in self.referenceGenomeList:
+            print("********** Homology Groups for Reference Genome, ",genome.name," **********",file=buf)
+            print("********** Gene Homology Groups ",file=buf)
+            for gene in genome.geneList:
+                if gene.homologyList:
+                    count += 1
+                    print("Homology group No. ",count," for gene ",gene.identifier,":",file=buf)
+                    print("  ",gene.homologyList,file=buf)
+            print("********** End of Gene Homology Groups ",file=buf)
+            for protein in genome.proteinList:
+                if protein.homologyList:
+                    count += 1
+                    print("Homology group No. ",count," for protein ",protein.identifier,":",file=buf)
+                    print("  ",protein.homologyList,file=buf)
+            print("********** End of Protein Homology Groups ",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
     def printReports2files(self):
@@ -1453,13 +1475,16 @@ class comparison(object):
         return
 
     def printReport(self):
-        self.writeMutualBestHitList()
-        self.writeSingularBestHitList()
-        self.writeLonerList()
-        self.writeCoreGenome()
-        self.writeParalogs()
-        self.writeCorrespondences()
-        self.writeHomologyGroups()
+        # Collect the whole report in memory and hand it to stdout in a single write
+        buf = io.StringIO()
+        self.writeMutualBestHitList(buf)
+        self.writeSingularBestHitList(buf)
+        self.writeLonerList(buf)
+        self.writeCoreGenome(buf)
+        self.writeParalogs(buf)
+        self.writeCorrespondences(buf)
+        self.writeHomologyGroups(buf)
+        sys.stdout.write(buf.getvalue())
         return
 
     def printAll2file(self,FILE_H):
@@ -1473,15 +1498,18 @@ class comparison(object):
         FILE_H.write("%s\n" % ("=========End Genome Set========="))
         return
 
-    def printAll(self):
-        print("=========Genome Set=============")
-        print("name:",self.name)
-        print("referenceGenome:",self.referenceGenome)
-        print("genomeCount:",self.genomeCount)
-        print("Set of genomes:")
+    def printAll(self,OUT_H=None):
+        buf = io.StringIO() if OUT_H is None else OUT_H
+        print("=========Genome Set=============",file=buf)
+        print("name:",self.name,file=buf)
+        print("referenceGenome:",self.referenceGenome,file=buf)
+        print("genomeCount:",self.genomeCount,file=buf)
+        print("Set of genomes:",file=buf)
         for genome in self.genomeList:
-            genome.printAll()
-        print("=========End Genome Set=========")
+            genome.printAll(buf)
+        print("=========End Genome Set=========",file=buf)
+        if OUT_H is None:
+            sys.stdout.write(buf.getvalue())
         return
 
 #############################################################################################################
@@ -1489,82 +1517,95 @@ class comparison(object):
 #############################################################################################################
 class genome(object):
 
+    # No per-instance __dict__: attributes are limited to those initialized below
+    __slots__ = ('name','species','isReference','file','contigList','geneList','proteinList',
+                 'geneIndex','proteinIndex','geneByCgpHeader','proteinByCgpHeader','paralogList',
+                 'maxMutualBestHitCount','mutualSelfHitCount')
+
     def __init__(self):
         self.name                 = ""     # Name of this genome (e.g., Lambda)
         self.species              = ""     # Species name for this genome (e.g., Ecoli_Lambda_phage)
         self.isReference          = False  # True if designated a reference genome
+        self.file                 = ""     # Genome fasta file, as named in the CGP log
         self.contigList           = []     # Set of contig names (fasta headers)
         self.geneList             = []     # List of gene_protein objects 
         self.proteinList          = []     # List of gene_protein objects 
+        self.geneIndex            = {}     # geneList objects keyed by (contigName,name)
+        self.proteinIndex         = {}     # proteinList objects keyed by (contigName,name)
+        self.geneByCgpHeader      = {}     # Lists of geneList objects keyed by cgpHeader
+        self.proteinByCgpHeader   = {}     # Lists of proteinList objects keyed by cgpHeader
         self.paralogList          = []     # List of paralogSet objects
+        self.maxMutualBestHitCount = 0     # Longest mutualBestHitList among this genome's genes/proteins
+        self.mutualSelfHitCount   = 0      # Number of genes/proteins recorded as their own mutual best hit
+
+    # Method recordMutualBestHit adds a mutual best hit to one of this genome's genes/proteins, keeping the tallies
+    # that let checkMutualBestHitList skip its scan when every list is in order
+    def recordMutualBestHit(self,obj,hit,hitGenomeName):
+        if obj.addMutualBestHit(hit,hitGenomeName):
+            if len(obj.mutualBestHitList) > self.maxMutualBestHitCount:
+                self.maxMutualBestHitCount = len(obj.mutualBestHitList)
+            if hit == obj.identifier:
+                self.mutualSelfHitCount += 1
+        return
 
-    def addParalog(self,dataArgs):
-        hitType = ""; gene1 = ""; gene2 = ""; protein1 = ""; protein2 = ""
-        geneCall1 = ""; geneCall2 = ""
+    # Methods addGene and addProtein record a new gene_protein object in the genome's list and lookup tables
+    def addGene(self,gene_obj):
+        self.geneList.append(gene_obj)
+        self.geneIndex[(gene_obj.contigName,gene_obj.name)] = gene_obj
+        self.geneByCgpHeader.setdefault(gene_obj.cgpHeader,[]).append(gene_obj)
+        return
 
-        # Read input parameters; not all these are being used just yet
-        if "hitType" in dataArgs.keys():
-            hitType = dataArgs["hitType"]
-        else:
+    def addProtein(self,protein_obj):
+        self.proteinList.append(protein_obj)
+        self.proteinIndex[(protein_obj.contigName,protein_obj.name)] = protein_obj
+        self.proteinByCgpHeader.setdefault(protein_obj.cgpHeader,[]).append(protein_obj)
+        return
+
+    def addParalog(self,dataArgs):
+        if "hitType" not in dataArgs:
             if PHATE_WARNINGS:
                 print("genomics_compareGenomes says, WARNING: hitType not defined")
-                return
-        match_gene    = re.search('gene',   hitType)
-        match_protein = re.search('protein',hitType)
-        if match_gene:
-            if "gene1" in dataArgs.keys():
-                gene1 = dataArgs["gene1"]
-            if "gene2" in dataArgs.keys():
-                gene2 = dataArgs["gene2"]
-        elif match_protein:
-            if "protein1" in dataArgs.keys():
-                protein1 = dataArgs["protein1"]
-            if "protein2" in dataArgs.keys():
-                protein2 = dataArgs["protein2"]
-        if "contig1" in dataArgs.keys():
-            contig1 = dataArgs["contig1"]
-        if "contig2" in dataArgs.keys():
-            contig2 = dataArgs["contig2"]
-        if "geneCall1" in dataArgs.keys():
-            geneCall1 = dataArgs["geneCall1"]
-        if "geneCall2" in dataArgs.keys():
-            geneCall2 = dataArgs["geneCall2"]
-        if "annotation1" in dataArgs.keys():
-            annotation1 = dataArgs["annotation1"]
-        if "annotation2" in dataArgs.keys():
-            annotation2 = dataArgs["annotation2"]
-
-        # Find gene1 and gene2 in genome; get gene identifiers
-        if hitType == "gene_paralog":
-            for gene_obj1 in self.geneList:
-                if gene_obj1.cgpHeader == gene1:
-                    for gene_obj2 in self.geneList:
-                        if gene_obj2.cgpHeader == gene2:
-                            paralogID = gene_obj2.identifier
-                            if paralogID not in gene_obj1.paralogList:
-                                gene_obj1.paralogList.append(paralogID)
-
-        # Find protein1 and protein2 in genome; get protein identifiers
-        elif hitType == "protein_paralog":
-            for protein_obj1 in self.proteinList:
-                if protein_obj1.cgpHeader == protein1:
-                    for protein_obj2 in self.proteinList:
-                        if protein_obj2.cgpHeader == protein2:
-                            paralogID = protein_obj2.identifier
-                            if paralogID not in protein_obj1.paralogList:
-                                protein_obj1.paralogList.append(paralogID)
+            return
+        self.ingestParalogs([dataArgs])
+        return
+
+    # Method ingestParalogs records a list of paralog dataArgs (as from readParalogs) in one pass. Both ends of each
+    # pair are resolved through the genome's cgpHeader lookup tables; each gene/protein's paralogList records the
+    # identifiers of its paralogs, once each, in the order first seen.
+    def ingestParalogs(self,paralogList):
+        for dataArgs in paralogList:
+            hitType = dataArgs.get("hitType","")
+            if hitType == "gene_paralog":
+                objIndex = self.geneByCgpHeader;    key1 = "gene1";    key2 = "gene2"
+            elif hitType == "protein_paralog":
+                objIndex = self.proteinByCgpHeader; key1 = "protein1"; key2 = "protein2"
+            else:
+                continue
+            paralogObjList = objIndex.get(dataArgs.get(key2,""))
+            if not paralogObjList:
+                continue
+            for obj1 in objIndex.get(dataArgs.get(key1,""),[]):
+                paralogSet = obj1.paralogSet
+                for obj2 in paralogObjList:
+                    paralogID = obj2.identifier
+                    if paralogID not in paralogSet:
+                        paralogSet.add(paralogID)
+                        obj1.paralogList.append(paralogID)
         return
 
     #===== GENOME DATA CHECK METHODS
 
     def checkMutualBestHitList(self,genomeCount):
+        # Nothing to report unless some list grew too long or holds its own gene/protein
+        if self.maxMutualBestHitCount <= genomeCount-1 and self.mutualSelfHitCount == 0:
+            return
         for gene in self.geneList:
             if len(gene.mutualBestHitList) > genomeCount-1:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes says, WARNING: mutualBestHitList for gene",gene.identifier,"incorrect")
                     print("   Length is ",len(gene.mutualBestHitList))
                     print("    ",gene.mutualBestHitList)
-            if gene.identifier in gene.mutualBestHitList:
+            if gene.identifier in gene.mutualBestHitSet:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes says, WARNING: gene,",gene.identifier," is listed in its own mutualBestHitList.")
 
@@ -1574,54 +1615,39 @@ class genome(object):
                     print("genomics_compareGenomes says, WARNING: mutualBestHitList for protein",protein.identifier,"incorrect")
                     print("   Length is ",len(protein.mutualBestHitList))
                     print("    ",protein.mutualBestHitList)
-            if protein.identifier in protein.mutualBestHitList:
+            if protein.identifier in protein.mutualBestHitSet:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes says, WARNING: protein,",protein.identifier," is listed in its own mutualBestHitList.")
         return
 
     def checkSingularBestHitList(self,genomeCount):
         for gene in self.geneList:
-            if gene.identifier in gene.singularBestHitList:
+            if gene.identifier in gene.singularBestHitSet:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes says, WARNING: gene,",gene.identifier," is listed in its own singularBestHitList.")
         for protein in self.proteinList:
-            if protein.identifier in protein.singularBestHitList:
+            if protein.identifier in protein.singularBestHitSet:
                 if PHATE_WARNINGS:
                     print("genomics_compareGenomes says, WARNING: protein,",protein.identifier," is listed in its own singularBestHitList.")
         return
 
     def checkUnique(self):
-        tempList = []
-        for gene in self.geneList:
-            if gene.identifier in tempList:
-                if PHATE_WARNINGS:
-                    print("genomics_compareGenomes genome obj says, WARNING: ",gene.identifier," is not unique")
-            else:
-                tempList.append(gene.identifier)
-            
-        tempList = []
-        for gene in self.geneList:
-            if gene.cgpHeader in tempList:
-                if PHATE_WARNINGS:
-                    print("genomics_compareGenomes genome obj says, WARNING: ",gene.cgpHeader," is not unique")
-            else:
-                tempList.append(gene.cgpHeader)
-            
-        tempList = []
-        for protein in self.proteinList:
-            if protein.identifier in tempList:
-                if PHATE_WARNINGS:
-                    print("genomics_compareGenomes genome obj says, WARNING: ",protein.identifier," is not unique")
-            else:
-                tempList.append(protein.identifier)
+        self.checkUniqueAttribute(self.geneList,"identifier")
+        self.checkUniqueAttribute(self.geneList,"cgpHeader")
+        self.checkUniqueAttribute(self.proteinList,"identifier")
+        self.checkUniqueAttribute(self.proteinList,"cgpHeader")
+        return
 
-        tempList = []
-        for protein in self.proteinList:
-            if protein.cgpHeader in tempList:
+    # Method checkUniqueAttribute warns about each gene_protein in objList whose attribute value was already seen
+    def checkUniqueAttribute(self,objList,attribute):
+        tempSet = set()
+        for obj in objList:
+            value = getattr(obj,attribute)
+            if value in tempSet:
                 if PHATE_WARNINGS:
-                    print("genomics_compareGenomes genome obj says, WARNING: ",protein.cgpHeader," is not unique")
+                    print("genomics_compareGenomes genome obj says, WARNING: ",value," is not unique")
             else:
-                tempList.append(protein.cgpHeader)
+                tempSet.add(value)
         return
 
     #===== GENOME PRINT METHODS
@@ -1638,11 +1664,7 @@ class genome(object):
         FILE_H.write("%s%s\n" % ("species:",self.species))
         FILE_H.write("%s%s\n" % ("isReference:",self.isReference))
         FILE_H.write("%s\n" % ("contigs:"))
-        if self.contigList:
-            for contig in self.contigList:
-                FILE_H.write("%s\n" % (contig))
-        else:
-            FILE_H.write("%s\n" % ("There are no contigs."))
+        FILE_H.write("%s\n" % ('\n'.join(self.contigList) if self.contigList else "There are no contigs."))
         if self.geneList:
             for gene in self.geneList:
                 gene.printAll2file(FILE_H)
@@ -1661,39 +1683,37 @@ class genome(object):
         FILE_H.write("%s\n" % ("=========End Genome===="))
         return
 
-    def printAll(self):
-        print("=========Genome========")
-        print("name:",self.name)
-        print("species:",self.species)
-        print("isReference:",self.isReference)
-        print("contigs:",)
-        if self.contigList:
-            for contig in self.contigList:
-                print(contig)
-        else:
-            print("There are no contigs.")
+    def printAll(self,OUT_H=None):
+        print("=========Genome========",file=OUT_H)
+        print("name:",self.name,file=OUT_H)
+        print("species:",self.species,file=OUT_H)
+        print("isReference:",self.isReference,file=OUT_H)
+        print("contigs:",file=OUT_H)
+        print('\n'.join(self.contigList) if self.contigList else "There are no contigs.",file=OUT_H)
         if self.geneList:
             for gene in self.geneList:
-                gene.printAll()
+                gene.printAll(OUT_H)
         else:
-            print("There are no genes.")
+            print("There are no genes.",file=OUT_H)
         if self.proteinList:
             for protein in self.proteinList:
-                protein.printAll()
+                protein.printAll(OUT_H)
         else:
-            print("There are no proteins.")
+            print("There are no proteins.",file=OUT_H)
         if self.paralogList:
             for paralogSet in self.paralogList:
-                paralogSet.printAll()
+                paralogSet.printAll(OUT_H)
         else:
-            print("There are no paralogs")
-        print("=========End Genome====")
+            print("There are no paralogs",file=OUT_H)
+        print("=========End Genome====",file=OUT_H)
         return
 
 #####################################################################################################
 # Class paralog organizes genes and proteins within a given genome that are considered paralogs.
 class paralogSet(object):
-    
+
+    __slots__ = ('paralogType','paralogList','setSize')
+
     def __init__(self):
         self.paralogType          = "unknown" # "gene" or "protein"
         self.paralogList          = []        # List of either gene or protein unique identifiers
@@ -1713,18 +1733,23 @@ class paralogSet(object):
         FILE_H.write("%s%s\n" % ("paralogList:",self.paralogList))
         return
 
-    def printAll(self):
-        print("paralogType:",self.paralogType)
-        print("setSize:",self.setSize)
-        print("paralogList:",self.paralogList)
+    def printAll(self,OUT_H=None):
+        print("paralogType:",self.paralogType,file=OUT_H)
+        print("setSize:",self.setSize,file=OUT_H)
+        print("paralogList:",self.paralogList,file=OUT_H)
         return
 
 ######################################################################################################
 # Class gene_protein stores meta-data about a gene or protein.
 class gene_protein(object):
 
-    def __init__(self):
-        self.type                 = "gene"    # "gene" or "protein"
+    # Many thousands of these are created per comparison; slots keep each one small
+    __slots__ = ('type','name','identifier','cgpHeader','number','parentGenome','contigName','annotation',
+                 'mutualBestHitList','singularBestHitList','mutualBestHitSet','singularBestHitSet','mutualBestHitByGenome',
+                 'correspondenceList','homologyList','lonerList','lonerSet','groupList','paralogList','paralogSet')
+
+    def __init__(self,type="gene"):
+        self.type                 = type      # "gene" or "protein"
         self.name                 = ""        # Ex: "phanotate_5"
         self.identifier           = ""        # Unique: genome + contig + name
         self.cgpHeader            = ""        # CGP-assigned header; Ex: cgp5/+/72/485/
@@ -1732,23 +1757,45 @@ class gene_protein(object):
         self.parentGenome         = ""        # Ex: "Lambda" - corresponds to a genome object's name
         self.contigName           = ""        # Ex: "Lambda_contig_1"; read from CGP report
         self.annotation           = ""        # The full annotation string, read from CGP report 
-        self.isLoner              = True      # True if this gene has no correspondences
         self.mutualBestHitList    = []        # list of gene identifiers that are mutual best hits, across genomes
         self.singularBestHitList  = []        # list of gene identifiers that are best hits, relative to this gene, across genomes
+        self.mutualBestHitSet     = set()     # Same identifiers as mutualBestHitList, for dedup and membership tests
+        self.mutualBestHitByGenome = {}       # First mutual best hit in each other genome, keyed by that genome's name
+        self.singularBestHitSet   = set()     # Same identifiers as singularBestHitList
         self.correspondenceList   = []        # List of corresponding genes (mutual or best-hit) across genomes: list of gene identifiers 
         self.homologyList         = []        # List of corresponding genes + paralogs and their corresponding genes
         self.lonerList            = []        # List of the genome names that this gene/protein is a loner with respect to
+        self.lonerSet             = set()     # Same names as lonerList
         self.groupList            = []        # list of all corresponding genes plus paralogs
         self.paralogList          = []        # List of paralogs within its own parent genome: list of gene identifiers <data is redundant; should pull paralog list as list of lists at genome level.
+        self.paralogSet           = set()     # Same identifiers as paralogList, for membership tests
 
-    def addMutualBestHit(self,hit):
-        self.mutualBestHitList.append(hit)
-        return
+    # Methods addMutualBestHit, addSingularBestHit, addLoner record each hit (or genome name) once
+    def addMutualBestHit(self,hit,hitGenomeName):   # returns True if the hit was not already recorded
+        if hit not in self.mutualBestHitSet:
+            self.mutualBestHitSet.add(hit)
+            self.mutualBestHitList.append(hit)
+            self.mutualBestHitByGenome.setdefault(hitGenomeName,hit)
+            return True
+        return False
 
     def addSingularBestHit(self,hit):
-        self.singularBestHitList.append(hit)
+        if hit not in self.singularBestHitSet:
+            self.singularBestHitSet.add(hit)
+            self.singularBestHitList.append(hit)
+        return
+
+    def addLoner(self,genomeName):
+        if genomeName not in self.lonerSet:
+            self.lonerSet.add(genomeName)
+            self.lonerList.append(genomeName)
         return
 
+    # A gene/protein is a loner while it has no mutual or singular best hit; derived, so it cannot go stale
+    @property
+    def isLoner(self):
+        return not self.mutualBestHitSet and not self.singularBestHitSet
+
     def addGroupMember(self,member):
         self.groupList.append(member)
 
@@ -1763,11 +1810,11 @@ class gene_protein(object):
     #===== GENE_PROTEIN DATA CHECK METHODS
 
     def verifyLoner(self):
-        if self.mutualBestHitList:
+        if self.mutualBestHitSet:
             if PHATE_WARNINGS:
                 print("genomics_compareGenomes says, Not a loner due to mutual best hit:",self.identifier,";",self.type)
             return False
-        if self.singularBestHistList:
+        if self.singularBestHitSet:
             if PHATE_WARNINGS:
                 print("genomics_compareGenomes says, Not a loner due to singular best hit:",self.identifier,";",self.type)
             return False
@@ -1776,33 +1823,33 @@ class gene_protein(object):
     #===== GENE_PROTEIN PRINT METHODS
 
     def writeMutualBestHitList2file(self,FILE_H):
-        for hit in self.mutualBestHitList:
-            FILE_H.write("%s%s\n" % ('   ',hit))
+        if self.mutualBestHitList:
+            FILE_H.write('   ' + '\n   '.join(self.mutualBestHitList) + '\n')
         return
 
-    def writeMutualBestHitList(self):
-        for hit in self.mutualBestHitList:
-            print(hit)
+    def writeMutualBestHitList(self,OUT_H=None):
+        if self.mutualBestHitList:
+            print('\n'.join(self.mutualBestHitList),file=OUT_H)
         return
 
     def writeSingularBestHitList2file(self,FILE_H):
-        for hit in self.singularBestHitList:
-            FILE_H.write("%s%s\n" % ('   ',hit))
+        if self.singularBestHitList:
+            FILE_H.write('   ' + '\n   '.join(self.singularBestHitList) + '\n')
         return
 
-    def writeSingularBestHitList(self):
-        for hit in self.singularBestHitList:
-            print(hit)
+    def writeSingularBestHitList(self,OUT_H=None):
+        if self.singularBestHitList:
+            print('\n'.join(self.singularBestHitList),file=OUT_H)
         return
 
     def writeLonerList2file(self,FILE_H):
-        for genomeString in self.lonerList:
-            FILE_H.write("%s\n" % (genomeString))
+        if self.lonerList:
+            FILE_H.write('\n'.join(self.lonerList) + '\n')
         return
 
-    def writeLonerList(self):
-        for genomeString in self.lonerList:
-            print(genomeString)
+    def writeLonerList(self,OUT_H=None):
+        if self.lonerList:
+            print('\n'.join(self.lonerList),file=OUT_H)
         return
 
     def printReport2file(self,FILE_H):
@@ -1828,19 +1875,19 @@ class gene_protein(object):
         FILE_H.write("%s\n" % ("==="))
         return
 
-    def printAll(self):
-        print("===type:",self.type)
-        print("name:",self.name)
-        print("identifier:",self.identifier)
-        print("cgpHeader:",self.cgpHeader)
-        print("number:",self.number)
-        print("parentGenome:",self.parentGenome)
-        print("contigName:",self.contigName)
-        print("annotation:",self.annotation)
-        print("isLoner:",self.isLoner)
-        print("mutualBestHitList:",self.mutualBestHitList)
-        print("singularBestHitList:",self.singularBestHitList)
-        print("correspondenceList:",self.correspondenceList)
-        print("paralogList:",self.paralogList)
-        print("===")
+    def printAll(self,OUT_H=None):
+        print("===type:",self.type,file=OUT_H)
+        print("name:",self.name,file=OUT_H)
+        print("identifier:",self.identifier,file=OUT_H)
+        print("cgpHeader:",self.cgpHeader,file=OUT_H)
+        print("number:",self.number,file=OUT_H)
+        print("parentGenome:",self.parentGenome,file=OUT_H)
+        print("contigName:",self.contigName,file=OUT_H)
+        print("annotation:",self.annotation,file=OUT_H)
+        print("isLoner:",self.isLoner,file=OUT_H)
+        print("mutualBestHitList:",self.mutualBestHitList,file=OUT_H)
+        print("singularBestHitList:",self.singularBestHitList,file=OUT_H)
+        print("correspondenceList:",self.correspondenceList,file=OUT_H)
+        print("paralogList:",self.paralogList,file=OUT_H)
+        print("===",file=OUT_H)
         return
@@ -17,9 +17,7 @@
 # This code was developed by Carol L. Ecale Zhou at Lawrence Livermore National Laboratory
 # THIS CODE IS COVERED BY THE GPL3 LICENSE. SEE INCLUDED FILE GPL-3.PDF FOR DETAILS.
 
-import sys, os, re, string, copy
-import time, datetime
-from subprocess import call
+import os
 import genomics_compareGenomes
 
 DEBUG = True
@@ -31,9 +29,10 @@ PHATE_WARNINGS = False
 PHATE_MESSAGES = False
 PHATE_PROGRESS = False
 
-PHATE_WARNINGS_STRING = os.environ["PHATE_PHATE_WARNINGS"]
-PHATE_MESSAGES_STRING = os.environ["PHATE_PHATE_MESSAGES"]
-PHATE_PROGRESS_STRING = os.environ["PHATE_PHATE_PROGRESS"]
+# Unset verbosity variables mean 'false'
+PHATE_WARNINGS_STRING = os.environ.get("PHATE_PHATE_WARNINGS","false")
+PHATE_MESSAGES_STRING = os.environ.get("PHATE_PHATE_MESSAGES","false")
+PHATE_PROGRESS_STRING = os.environ.get("PHATE_PHATE_PROGRESS","false")
 
 if PHATE_WARNINGS_STRING.lower() == 'true':
     PHATE_WARNINGS = True
@@ -55,23 +54,28 @@ GENOMICS_RESULTS_DIR = os.environ["PHATE_GENOMICS_RESULTS_DIR"]
 ###########################################################################################
 # BEGIN MAIN
 #
+# The comparison parses CGP reports in a multiprocessing Pool; under the spawn start method each worker
+# re-imports this script, so the run itself must only happen when it is executed as the main program.
 
-if PHATE_PROGRESS:
-    print("genomics_driver says, Performing comparisons among genomes.")
+def main():
+    if PHATE_PROGRESS:
+        print("genomics_driver says, Performing comparisons among genomes.")
 
-# Create genome comparison object
-genomeComparison = genomics_compareGenomes.comparison()
+    # Create genome comparison object
+    genomeComparison = genomics_compareGenomes.comparison()
 
-# Create output directory
-try:
-    os.stat(GENOMICS_RESULTS_DIR)
-except:
-    os.mkdir(GENOMICS_RESULTS_DIR)
+    # Create output directory
+    try:
+        os.stat(GENOMICS_RESULTS_DIR)
+    except:
+        os.mkdir(GENOMICS_RESULTS_DIR)
 
-# Perform genome comparisons
-genomeComparison.performComparison()
+    # Perform genome comparisons
+    genomeComparison.performComparison()
 
-# Clean up
-if PHATE_PROGRESS:
-    print("genomics_driver says, Genome comparison complete.")
+    # Clean up
+    if PHATE_PROGRESS:
+        print("genomics_driver says, Genome comparison complete.")
 
+if __name__ == '__main__':
+    main()